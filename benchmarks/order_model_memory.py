@@ -0,0 +1,62 @@
+"""Memory used by OrderModel instances compared with the previous
+implementation (private fields behind properties, per-instance __dict__).
+
+Run from the repository root:
+
+    python benchmarks/order_model_memory.py --orders 1000000
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from abc import ABC
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from order.OrderModel import OrderModel  # noqa: E402
+
+
+class LegacyOrderModel(ABC):
+    def __init__(self, order_id=None, client=None, items=None):
+        self.__order_id = order_id
+        self.__client = client
+        self.__items = items
+
+    @property
+    def client(self):
+        return self.__client
+
+    @property
+    def items(self):
+        return self.__items
+
+    @property
+    def order_id(self):
+        return self.__order_id
+
+
+def measure(model, count, items):
+    tracemalloc.start()
+    orders = [model(order_id, order_id % 1000, items) for order_id in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del orders
+    return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=1000000)
+    args = parser.parse_args(argv)
+    # items are shared so only the per-order overhead is measured
+    items = [{'name': 'name1', 'value': 10}]
+    legacy = measure(LegacyOrderModel, args.orders, items)
+    slotted = measure(OrderModel, args.orders, items)
+    print('orders:        {}'.format(args.orders))
+    print('legacy model:  {:.1f} MiB ({:.0f} B/order)'.format(legacy / 2 ** 20, legacy / args.orders))
+    print('slotted model: {:.1f} MiB ({:.0f} B/order)'.format(slotted / 2 ** 20, slotted / args.orders))
+    print('saved:         {:.0%}'.format(1 - slotted / legacy))
+
+
+if __name__ == '__main__':
+    main()
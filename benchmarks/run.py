@@ -0,0 +1,148 @@
+"""Benchmarks for the Order, OrderRepository and Client hot paths.
+
+Results are written as JSON so runs can be compared over time. Run from the
+repository root:
+
+    python benchmarks/run.py --sizes 1000,10000,100000,1000000 --output bench.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from client.client import Client  # noqa: E402
+from fake_api.server import FakeShopServer  # noqa: E402
+from order.ConcurrentOrderRepository import ConcurrentOrderRepository  # noqa: E402
+from order.FileOrderRepository import FileOrderRepository  # noqa: E402
+from order.Order import Order  # noqa: E402
+from order.OrderModel import OrderModel  # noqa: E402
+from order.OrderRepository import OrderRepository  # noqa: E402
+from order.SqliteOrderRepository import SqliteOrderRepository  # noqa: E402
+from order_model_memory import LegacyOrderModel, measure  # noqa: E402
+
+ITEMS = [{'name': 'name1', 'value': 10}, {'name': 'name2', 'value': 20}]
+
+
+def make_orders(count, start=0):
+    return [OrderModel(order_id, order_id % 1000, ITEMS) for order_id in range(start, start + count)]
+
+
+def timed(name, backend, size, operations, function):
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+    return {'name': name, 'backend': backend, 'size': size, 'operations': operations,
+            'seconds': seconds, 'ops_per_sec': operations / seconds if seconds else None}
+
+
+def repository_backends(directory):
+    yield 'memory', OrderRepository
+    yield 'concurrent', ConcurrentOrderRepository
+    yield 'sqlite', SqliteOrderRepository
+    yield 'file', lambda: FileOrderRepository(os.path.join(directory, 'orders-{}.log'.format(time.monotonic_ns())))
+
+
+def bench_repositories(sizes, operations, backends):
+    results = []
+    directory = tempfile.mkdtemp()
+    try:
+        for backend, factory in repository_backends(directory):
+            if backend not in backends:
+                continue
+            for size in sizes:
+                repository = factory()
+                orders = make_orders(size)
+                results.append(timed('repository.add_many', backend, size, size,
+                                     lambda: repository.add_many(orders)))
+                count = min(operations, size)
+                ids = random.Random(size).sample(range(size), count)
+                results.append(timed('repository.find_by_id', backend, size, count,
+                                     lambda: [repository.find_by_id(order_id) for order_id in ids]))
+                results.append(timed('order.get_order', backend, size, count,
+                                     lambda: [Order(repository).get_order(order_id) for order_id in ids]))
+                new_orders = make_orders(count, start=size)
+                results.append(timed('repository.add', backend, size, count,
+                                     lambda: [repository.add(order) for order in new_orders]))
+                updates = [OrderModel(order_id, 1, ITEMS) for order_id in ids]
+                results.append(timed('repository.update', backend, size, count,
+                                     lambda: [repository.update(order.order_id, order) for order in updates]))
+                results.append(timed('repository.delete_by_id', backend, size, count,
+                                     lambda: [repository.delete_by_id(order_id) for order_id in ids]))
+                if hasattr(repository, 'close'):
+                    repository.close()
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+def bench_order_model(sizes):
+    results = []
+    for size in sizes:
+        results.append(timed('order_model.construct', 'slotted', size, size, lambda: make_orders(size)))
+        for backend, model in (('slotted', OrderModel), ('legacy', LegacyOrderModel)):
+            result = {'name': 'order_model.memory', 'backend': backend, 'size': size,
+                      'bytes': measure(model, size, ITEMS)}
+            result['bytes_per_order'] = result['bytes'] / size
+            results.append(result)
+    return results
+
+
+def bench_client(requests_count, workers):
+    results = []
+    with FakeShopServer(seed=1) as server, Client(pool_size=workers) as client:
+        server.populate(clients=100, orders_per_client=10, items_per_order=5)
+        client.fake_api = server.url
+        ids = [client_id % 100 + 1 for client_id in range(requests_count)]
+        results.append(timed('client.get_client', 'sequential', requests_count, requests_count,
+                             lambda: [client.get_client(client_id) for client_id in ids]))
+        results.append(timed('client.get_clients_by_ids', 'threads-{}'.format(workers), requests_count,
+                             requests_count, lambda: client.get_clients_by_ids(ids)))
+        results.append(timed('client.get_client_payment_amount', 'sequential', requests_count, requests_count,
+                             lambda: [client.get_client_payment_amount(client_id) for client_id in ids]))
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'commit': commit,
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000',
+                        help='comma separated repository sizes')
+    parser.add_argument('--operations', type=int, default=10000,
+                        help='single-order operations timed per size')
+    parser.add_argument('--backends', default='memory,concurrent,sqlite,file')
+    parser.add_argument('--requests', type=int, default=2000, help='HTTP requests for the client benchmark')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--output', default='bench.json')
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = bench_repositories(sizes, args.operations, args.backends.split(','))
+    results += bench_order_model(sizes)
+    results += bench_client(args.requests, args.workers)
+    with open(args.output, 'w') as output:
+        json.dump({'meta': metadata(), 'results': results}, output, indent=2)
+    for result in results:
+        rate = result.get('ops_per_sec')
+        detail = '{:>12.0f} ops/s'.format(rate) if rate else '{:>12.0f} B/order'.format(result['bytes_per_order'])
+        print('{:<28} {:<12} {:>8} {}'.format(result['name'], result['backend'], result['size'], detail))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import argparse
+import contextlib
+import queue
+import sys
+import threading
+import time
+from itertools import islice
+
+from order import OrderCodec
+from order.FileOrderRepository import FileOrderRepository
+from order.OrderRepository import OrderRepository
+from order.SqliteOrderRepository import SqliteOrderRepository
+
+BACKENDS = ('memory', 'file', 'sqlite')
+
+
+def open_repository(backend, path=None):
+    if backend == 'memory':
+        return OrderRepository()
+    if path is None:
+        raise ValueError('Backend {} needs a --path'.format(backend))
+    if backend == 'file':
+        return FileOrderRepository(path)
+    if backend == 'sqlite':
+        return SqliteOrderRepository(path)
+    raise ValueError('Unknown backend {}'.format(backend))
+
+
+class Progress:
+    # prints the running count and orders/sec at most every interval seconds
+    def __init__(self, action, output=None, interval=1.0, clock=time.monotonic):
+        self.action = action
+        self.output = output
+        self.interval = interval
+        self.clock = clock
+        self.count = 0
+        self.started = self.reported = clock()
+
+    @property
+    def rate(self):
+        elapsed = self.clock() - self.started
+        return self.count / elapsed if elapsed else 0.0
+
+    def advance(self, count):
+        self.count += count
+        if self.output is not None and self.clock() - self.reported >= self.interval:
+            self.reported = self.clock()
+            self.output.write('\r{} {} orders, {:.0f} orders/s'.format(self.action, self.count, self.rate))
+            self.output.flush()
+
+    def finish(self):
+        if self.output is not None:
+            self.output.write('\r{} {} orders, {:.0f} orders/s\n'.format(self.action, self.count, self.rate))
+
+
+def import_orders(repository, lines, batch_size=1000, queue_size=8, progress=None):
+    # a producer thread parses batches into a bounded queue while this thread
+    # inserts them, returns the number of orders added and of skipped duplicates
+    batches = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def put(batch):
+        # gives up once the consumer has stopped, the queue may stay full
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def produce():
+        try:
+            orders = OrderCodec.read_ndjson(lines)
+            while not stop.is_set():
+                batch = list(islice(orders, batch_size))
+                if not batch:
+                    break
+                put(batch)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            put(None)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    added = skipped = 0
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            inserted = sum(repository.add_many(batch))
+            added += inserted
+            skipped += len(batch) - inserted
+            if progress is not None:
+                progress.advance(len(batch))
+    finally:
+        stop.set()
+        producer.join()
+    if errors:
+        raise errors[0]
+    return added, skipped
+
+
+def export_orders(repository, output, batch_size=1000, progress=None):
+    orders = repository.iter_orders()
+    if progress is not None:
+        orders = _counted(orders, progress)
+    return OrderCodec.write_ndjson(orders, output, chunk_size=batch_size)
+
+
+def _counted(orders, progress):
+    for order in orders:
+        yield order
+        progress.advance(1)
+
+
+def _open(path, mode):
+    if path == '-':
+        # standard streams are left open
+        return contextlib.nullcontext(sys.stdin if 'r' in mode else sys.stdout)
+    return open(path, mode, encoding='utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import and export orders as newline-delimited JSON')
+    parser.add_argument('--backend', choices=BACKENDS, default='memory')
+    parser.add_argument('--path', help='log file or sqlite database for the file and sqlite backends')
+    parser.add_argument('--batch-size', type=int, default=1000, help='orders per add_many call and write')
+    parser.add_argument('--queue-size', type=int, default=8, help='parsed batches waiting to be inserted')
+    parser.add_argument('--quiet', action='store_true', help='do not print progress')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('import', help='add orders from a file to the repository').add_argument(
+        'input', help='NDJSON file, - for stdin')
+    commands.add_parser('export', help='write every order in the repository to a file').add_argument(
+        'output', help='NDJSON file, - for stdout')
+    args = parser.parse_args(argv)
+
+    try:
+        repository = open_repository(args.backend, args.path)
+    except ValueError as error:
+        parser.error(str(error))
+    progress = Progress(args.command + 'ed', None if args.quiet else sys.stderr)
+    try:
+        if args.command == 'import':
+            with _open(args.input, 'r') as lines:
+                added, skipped = import_orders(repository, lines, args.batch_size, args.queue_size, progress)
+            progress.finish()
+            if skipped and not args.quiet:
+                sys.stderr.write('skipped {} orders already in the repository\n'.format(skipped))
+        else:
+            with _open(args.output, 'w') as output:
+                export_orders(repository, output, args.batch_size, progress)
+            progress.finish()
+    finally:
+        if hasattr(repository, 'close'):
+            repository.close()
+
+
+if __name__ == '__main__':
+    main()
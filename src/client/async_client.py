@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from client.client import _sum_order_values
+from client.singleflight import AsyncSingleFlight
+
+
+class AsyncResponse:
+    def __init__(self, status_code, json=None, text=None):
+        self.status_code = status_code
+        self.json = json
+        self.text = text
+
+
+class AsyncClient:
+    def __init__(self, max_concurrency=100, timeout=10, session=None, coalesce=False):
+        self.fake_api = 'https://virtual-shop.pl/api/clients'
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.session = session
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.__owns_session = session is None
+        self.__semaphore = None
+
+    async def close(self):
+        if self.__owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _request(self, method, url, body=None):
+        if self.session is None:
+            if aiohttp is None:
+                raise ImportError('AsyncClient requires aiohttp, install it with pip install aiohttp')
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.__semaphore:
+            async with self.session.request(method, url, json=body) as response:
+                text = (await response.read()).decode('utf-8')
+        try:
+            payload = json.loads(text) if text else None
+        except ValueError:
+            payload = None
+        return AsyncResponse(response.status, payload, text)
+
+    async def _coalesce(self, key, fetch):
+        if self.single_flight is None:
+            return await fetch()
+        return await self.single_flight.do(key, fetch)
+
+    async def gather(self, *calls):
+        # errors are returned in place so one failing call does not cancel
+        # the rest of the batch
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    async def get_clients_by_ids(self, client_ids):
+        return await self.gather(*[self.get_client(client_id) for client_id in client_ids])
+
+    async def add_client(self, body):
+        if isinstance(body, dict) is False:
+            raise TypeError('Body must be dictionary')
+        if 'email' not in body or 'name' not in body or 'surname' not in body:
+            raise ValueError('Body must contain email, name and surname')
+        response = await self._request('POST', self.fake_api + '/add', body)
+        if 200 <= response.status_code <= 299:
+            return response
+        elif response.status_code == 409:
+            return 'User of given email exists'
+        else:
+            return 'Some horrible error happend'
+
+    async def get_client(self, client_id):
+        if type(client_id) is not int:
+            raise TypeError('Client id must be integer')
+        return await self._coalesce(('get_client', client_id), lambda: self._fetch_client(client_id))
+
+    async def _fetch_client(self, client_id):
+        response = await self._request('GET', self.fake_api + '/{}'.format(client_id))
+        if 200 <= response.status_code <= 299:
+            return response.json
+        if response.status_code == 404:
+            return 'User does not exist'
+        else:
+            return 'Something went horribly wrong'
+
+    async def get_clients(self):
+        return await self._request('GET', self.fake_api)
+
+    async def update_client(self, client_id, body):
+        if type(client_id) is not int or isinstance(body, dict) is False:
+            raise TypeError('Wrong types')
+        if 'email' not in body or 'name' not in body or 'surname' not in body:
+            raise ValueError('Body must contain email, name and surname')
+        response = await self._request('PUT', self.fake_api + '/{}'.format(client_id), body)
+        if 200 <= response.status_code <= 299 or response.status_code == 409 \
+                or response.status_code == 404:
+            return response
+        else:
+            return 'Something went horribly wrong'
+
+    async def delete_client(self, client_id):
+        if type(client_id) is not int:
+            raise TypeError('Client id must be integer')
+        return await self._request('DELETE', self.fake_api + '/{}'.format(client_id))
+
+    async def get_client_orders(self, client_id):
+        if type(client_id) is not int:
+            raise TypeError('Client id and Order id must be integers')
+        return await self._coalesce(('get_client_orders', client_id), lambda: self._request(
+            'GET', self.fake_api + '/{}/orders'.format(client_id)))
+
+    async def get_client_order(self, client_id, order_id):
+        if type(client_id) is not int or type(order_id) is not int:
+            raise TypeError('Client id and Order id must be integers')
+        return await self._request('GET', self.fake_api + '/{}/order/{}'.format(
+            client_id, order_id))
+
+    async def get_client_payment_amount(self, client_id):
+        response = await self.get_client_orders(client_id)
+        return _sum_order_values(response.json['orders'])
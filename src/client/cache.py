@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class ResponseCache:
+    def __init__(self, max_size=1024, ttl=60, clock=time.monotonic):
+        if max_size <= 0:
+            raise ValueError('Cache size must be greater than 0')
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.__entries = OrderedDict()
+        self.__groups = {}
+        self.__lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at, group = entry
+            if expires_at is not None and expires_at <= self.clock():
+                self.__remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, group=None, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else self.clock() + ttl
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (value, expires_at, group)
+            if group is not None:
+                self.__groups.setdefault(group, set()).add(key)
+            while len(self.__entries) > self.max_size:
+                self.__remove(next(iter(self.__entries)))
+                self.evictions += 1
+        return value
+
+    def invalidate(self, key):
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+
+    def invalidate_group(self, group):
+        with self.__lock:
+            for key in list(self.__groups.get(group, ())):
+                self.__remove(key)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__groups.clear()
+
+    def stats(self):
+        return {'size': len(self.__entries), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'expirations': self.expirations}
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __remove(self, key):
+        _, _, group = self.__entries.pop(key)
+        if group is not None:
+            keys = self.__groups[group]
+            keys.discard(key)
+            if not keys:
+                del self.__groups[group]
@@ -1,17 +1,94 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from client.cache import MISSING
+from client.resilience import CircuitOpenError
+from client.singleflight import SingleFlight
+
+# methods safe to repeat, only these are retried by the retry policy
+IDEMPOTENT = frozenset(('get_client', 'get_clients', 'iter_clients', 'get_client_orders', 'get_client_order',
+                        'delete_client'))
+
+
+def _json_body(response):
+    # requests exposes the decoded body through a method, test doubles
+    # through an attribute
+    body = response.json
+    return body() if callable(body) else body
+
+
+def _size(payload):
+    return len(payload) if isinstance(payload, (bytes, str)) else 0
+
+
+def _retries(response):
+    # retries done by urllib3 for this response, if any
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    history = getattr(retries, 'history', None)
+    return len(history) if isinstance(history, tuple) else 0
+
+
+def _sum_order_values(orders):
+    # items of all orders are flattened and summed in C. Integer totals stay
+    # exact ints, fsum is used only when there are floats so their total is
+    # exact to the last bit
+    values = list(map(itemgetter('value'), chain.from_iterable(map(itemgetter('order'), orders))))
+    if all(isinstance(value, int) for value in values):
+        return sum(values)
+    return math.fsum(values)
 
 
 class Client:
-    def __init__(self):
+    def __init__(self, pool_size=10, timeout=10, retries=0, backoff_factor=0.1, cache=None,
+                 metrics=None, coalesce=False, retry_policy=None, breakers=None):
         self.fake_api = 'https://virtual-shop.pl/api/clients'
+        self.cache = cache
+        self.metrics = metrics
+        # retries on 5xx and connection errors for idempotent methods, and
+        # per-endpoint circuit breakers failing fast while the API is down
+        self.retry_policy = retry_policy
+        self.breakers = breakers
+        # concurrent identical reads share one request when enabled
+        self.single_flight = SingleFlight() if coalesce else None
+        self.pool_size = pool_size
+        self.timeout = timeout
+        # one keep-alive session per client, so repeated calls reuse pooled
+        # connections instead of opening a new one every time
+        self.session = requests.Session()
+        # like requests' own default, reads are not retried when retries is 0
+        # so a read timeout still reaches callers as requests.ReadTimeout
+        max_retries = Retry(total=retries, backoff_factor=backoff_factor, read=False if retries == 0 else None)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def add_client(self, body):
         if isinstance(body, type({'something': 'somethingelse'})) is False:
             raise TypeError('Body must be dictionary')
         if 'email' not in body or 'name' not in body or 'surname' not in body:
             raise ValueError('Body must contain email, name and surname')
-        response = requests.post(self.fake_api + '/add', json=body)
+        response = self._send('add_client', 'post', self.fake_api + '/add', json=body)
         if 200 <= response.status_code <= 299:
+            if self.cache is not None:
+                body = _json_body(response)
+                if isinstance(body, dict) and 'id' in body:
+                    self.cache.invalidate_group(body['id'])
             return response
         elif response.status_code == 409:
             return 'User of given email exists'
@@ -21,16 +98,43 @@ class Client:
     def get_client(self, client_id):
         if type(client_id) is not int:
             raise TypeError('Client id must be integer')
-        response = requests.get(self.fake_api + '/{}'.format(client_id))
+        key = ('get_client', client_id)
+        cached = self._from_cache(key)
+        if cached is not MISSING:
+            return cached
+        return self._coalesce(key, lambda: self._fetch_client(key, client_id))
+
+    def _fetch_client(self, key, client_id):
+        response = self._send('get_client', 'get', self.fake_api + '/{}'.format(client_id))
         if 200 <= response.status_code <= 299:
-            return response.json
+            return self._to_cache(key, client_id, _json_body(response))
         if response.status_code == 404:
             return 'User does not exist'
         else:
             return 'Something went horribly wrong'
 
     def get_clients(self):
-        return requests.get(self.fake_api)
+        return self._send('get_clients', 'get', self.fake_api)
+
+    def iter_clients(self, page_size=100):
+        if type(page_size) is not int:
+            raise TypeError('Page size must be integer')
+        if page_size <= 0:
+            raise ValueError('Page size must be greater than 0')
+        # pages are fetched lazily, only one page is held in memory and
+        # callers can stop before the last one is requested
+        page = 1
+        while True:
+            response = self._send('iter_clients', 'get', self.fake_api,
+                                  params={'page': page, 'page_size': page_size})
+            if not 200 <= response.status_code <= 299:
+                raise requests.HTTPError('Something went horribly wrong', response=response)
+            clients = _json_body(response)['results']
+            for client in clients:
+                yield client
+            if len(clients) < page_size:
+                return
+            page += 1
 
     def update_client(self, client_id, body):
         if type(client_id) is not int or isinstance(body, type({'s': 's'})) \
@@ -38,7 +142,9 @@ class Client:
             raise TypeError('Wrong types')
         if 'email' not in body or 'name' not in body or 'surname' not in body:
             raise ValueError('Body must contain email, name and surname')
-        response = requests.put(self.fake_api + '/{}'.format(client_id), json=body)
+        response = self._send('update_client', 'put', self.fake_api + '/{}'.format(client_id), json=body)
+        if self.cache is not None:
+            self.cache.invalidate_group(client_id)
         if 200 <= response.status_code <= 299 or response.status_code == 409 \
                 or response.status_code == 404:
             return response
@@ -48,27 +154,131 @@ class Client:
     def delete_client(self, client_id):
         if type(client_id) is not int:
             raise TypeError('Client id must be integer')
-        return requests.delete(self.fake_api + '/{}'.format(client_id))
+        response = self._send('delete_client', 'delete', self.fake_api + '/{}'.format(client_id))
+        if self.cache is not None:
+            self.cache.invalidate_group(client_id)
+        return response
 
     def get_client_orders(self, client_id):
         if type(client_id) is not int:
             raise TypeError('Client id and Order id must be integers')
-        return requests.get(self.fake_api + '/{}/orders'.format(client_id))
+        key = ('get_client_orders', client_id)
+        cached = self._from_cache(key)
+        if cached is not MISSING:
+            return cached
+        return self._coalesce(key, lambda: self._fetch_client_orders(key, client_id))
+
+    def _fetch_client_orders(self, key, client_id):
+        response = self._send('get_client_orders', 'get', self.fake_api + '/{}/orders'.format(client_id))
+        if 200 <= response.status_code <= 299:
+            return self._to_cache(key, client_id, response)
+        return response
 
     def get_client_order(self, client_id, order_id):
         if type(client_id) is not int or type(order_id) is not int:
             raise TypeError('Client id and Order id must be integers')
-        return requests.get(self.fake_api + '/{}/order/{}'.format(
+        key = ('get_client_order', client_id, order_id)
+        cached = self._from_cache(key)
+        if cached is not MISSING:
+            return cached
+        response = self._send('get_client_order', 'get', self.fake_api + '/{}/order/{}'.format(
             client_id, order_id))
+        if 200 <= response.status_code <= 299:
+            return self._to_cache(key, client_id, response)
+        return response
+
+    def _send(self, name, verb, url, **kwargs):
+        if self.retry_policy is None and self.breakers is None:
+            return self._attempt(name, verb, url, kwargs)
+        breaker = None if self.breakers is None else self.breakers.for_endpoint(name)
+        policy = self.retry_policy if name in IDEMPOTENT else None
+        attempt = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError('Circuit for {} is open'.format(name))
+            response = error = None
+            try:
+                response = self._attempt(name, verb, url, kwargs)
+            except Exception as raised:
+                error = raised
+            if breaker is not None:
+                if error is None and response.status_code < 500:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+            if policy is None or not policy.should_retry(attempt, response, error):
+                if error is not None:
+                    raise error
+                return response
+            if self.metrics is not None:
+                self.metrics.record_retry(name)
+            policy.sleep(policy.delay(attempt))
+            attempt += 1
+
+    def _attempt(self, name, verb, url, kwargs):
+        send = getattr(self.session, verb)
+        if self.metrics is None:
+            return send(url, timeout=self.timeout, **kwargs)
+        started = time.perf_counter()
+        try:
+            response = send(url, timeout=self.timeout, **kwargs)
+        except Exception:
+            self.metrics.observe(name, time.perf_counter() - started, 'error')
+            raise
+        self.metrics.observe(name, time.perf_counter() - started, response.status_code,
+                             _size(getattr(getattr(response, 'request', None), 'body', None)),
+                             _size(getattr(response, 'content', None)), _retries(response))
+        return response
+
+    def _coalesce(self, key, fetch):
+        if self.single_flight is None:
+            return fetch()
+        return self.single_flight.do(key, fetch)
+
+    def _from_cache(self, key):
+        if self.cache is None:
+            return MISSING
+        return self.cache.get(key)
+
+    def _to_cache(self, key, client_id, value):
+        # entries are grouped by client id so writes to a client drop all of them
+        if self.cache is not None:
+            self.cache.set(key, value, group=client_id)
+        return value
+
+    def get_clients_by_ids(self, client_ids, max_workers=None):
+        return self._fan_out(self.get_client, client_ids, max_workers)
+
+    def get_client_orders_many(self, client_ids, max_workers=None):
+        return self._fan_out(self.get_client_orders, client_ids, max_workers)
+
+    def _fan_out(self, method, client_ids, max_workers):
+        client_ids = list(client_ids)
+        if any(type(client_id) is not int for client_id in client_ids):
+            raise TypeError('Client ids must be integers')
+
+        def call(client_id):
+            # errors are kept per id so one failure does not abort the batch
+            try:
+                return method(client_id)
+            except (requests.RequestException, ConnectionError) as error:
+                return error
+
+        # by default there are as many workers as pooled connections
+        with ThreadPoolExecutor(max_workers=max_workers or self.pool_size) as executor:
+            return list(executor.map(call, client_ids))
 
     def get_client_payment_amount(self, client_id):
         response = self.get_client_orders(client_id)
-        amount = 0
-        orders = response.json['orders']
-        for order in orders:
-            items = order['order']
-            for item in items:
-                amount += item['value']
-
-        return amount
+        return _sum_order_values(_json_body(response)['orders'])
+
+    def get_clients_payment_amounts(self, client_ids, max_workers=None):
+        amounts = []
+        for response in self.get_client_orders_many(client_ids, max_workers):
+            # failed fetches are kept in place like in get_client_orders_many
+            if isinstance(response, Exception) or not 200 <= response.status_code <= 299:
+                amounts.append(response)
+            else:
+                amounts.append(_sum_order_values(_json_body(response)['orders']))
+        return amounts
 
@@ -0,0 +1,89 @@
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class ClientMetrics:
+    # per-method latency histograms, status code counts, bytes transferred
+    # and retries, exported in the Prometheus text format
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='shop_client'):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self.listeners = []
+        self.__latency = {}
+        self.__statuses = {}
+        self.__bytes = {}
+        self.__retries = {}
+        self.__lock = threading.Lock()
+
+    def add_listener(self, listener):
+        # listener(method, seconds, status) is called after every request
+        self.listeners.append(listener)
+
+    def observe(self, method, seconds, status, bytes_sent=0, bytes_received=0, retries=0):
+        with self.__lock:
+            histogram = self.__latency.get(method)
+            if histogram is None:
+                histogram = self.__latency[method] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][bisect_left(self.buckets, seconds)] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+            key = (method, str(status))
+            self.__statuses[key] = self.__statuses.get(key, 0) + 1
+            for direction, size in (('sent', bytes_sent), ('received', bytes_received)):
+                if size:
+                    self.__bytes[(method, direction)] = self.__bytes.get((method, direction), 0) + size
+            if retries:
+                self.__retries[method] = self.__retries.get(method, 0) + retries
+        for listener in self.listeners:
+            listener(method, seconds, status)
+
+    def record_retry(self, method, count=1):
+        with self.__lock:
+            self.__retries[method] = self.__retries.get(method, 0) + count
+
+    def status_count(self, method, status):
+        return self.__statuses.get((method, str(status)), 0)
+
+    def request_count(self, method):
+        histogram = self.__latency.get(method)
+        return 0 if histogram is None else histogram[2]
+
+    def retry_count(self, method):
+        return self.__retries.get(method, 0)
+
+    def bytes_count(self, method, direction):
+        return self.__bytes.get((method, direction), 0)
+
+    def to_prometheus(self):
+        name = self.prefix
+        lines = []
+        with self.__lock:
+            lines.append('# HELP {}_request_duration_seconds Request latency.'.format(name))
+            lines.append('# TYPE {}_request_duration_seconds histogram'.format(name))
+            for method, (counts, total, count) in sorted(self.__latency.items()):
+                cumulative = 0
+                for bound, bucket in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += bucket
+                    lines.append('{}_request_duration_seconds_bucket{{method="{}",le="{}"}} {}'.format(
+                        name, method, bound, cumulative))
+                lines.append('{}_request_duration_seconds_sum{{method="{}"}} {}'.format(name, method, total))
+                lines.append('{}_request_duration_seconds_count{{method="{}"}} {}'.format(name, method, count))
+            lines.append('# HELP {}_responses_total Responses by status code.'.format(name))
+            lines.append('# TYPE {}_responses_total counter'.format(name))
+            for (method, status), count in sorted(self.__statuses.items()):
+                lines.append('{}_responses_total{{method="{}",status="{}"}} {}'.format(name, method, status, count))
+            lines.append('# HELP {}_bytes_total Bytes transferred.'.format(name))
+            lines.append('# TYPE {}_bytes_total counter'.format(name))
+            for (method, direction), count in sorted(self.__bytes.items()):
+                lines.append('{}_bytes_total{{method="{}",direction="{}"}} {}'.format(name, method, direction, count))
+            lines.append('# HELP {}_retries_total Retried requests.'.format(name))
+            lines.append('# TYPE {}_retries_total counter'.format(name))
+            for method, count in sorted(self.__retries.items()):
+                lines.append('{}_retries_total{{method="{}"}} {}'.format(name, method, count))
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        with open(path, 'w') as output:
+            output.write(self.to_prometheus())
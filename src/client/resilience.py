@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+
+import requests
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+class RetryPolicy:
+    # exponential backoff with full jitter, attempt n waits a random time
+    # between 0 and min(max_delay, base_delay * 2 ** n) so clients that
+    # failed together do not retry together
+    def __init__(self, attempts=3, base_delay=0.1, max_delay=2.0, statuses=(500, 502, 503, 504),
+                 exceptions=(requests.ConnectionError, requests.Timeout, ConnectionError),
+                 random=random.random, sleep=time.sleep):
+        if attempts < 1:
+            raise ValueError('Attempts must be greater than 0')
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+        self.exceptions = exceptions
+        self.random = random
+        self.sleep = sleep
+
+    def delay(self, attempt):
+        return self.random() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    def should_retry(self, attempt, response=None, error=None):
+        if attempt + 1 >= self.attempts:
+            return False
+        if error is not None:
+            return isinstance(error, self.exceptions)
+        return response.status_code in self.statuses
+
+
+class CircuitBreaker:
+    # opens after failure_threshold failures in a row and rejects calls for
+    # reset_timeout seconds, then lets a single trial call through and
+    # closes again if it succeeds
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        if failure_threshold < 1:
+            raise ValueError('Failure threshold must be greater than 0')
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.rejected = 0
+        self.__opened_at = None
+        self.__trial = False
+        self.__lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.__lock:
+            return self.__state()
+
+    def allow(self):
+        with self.__lock:
+            state = self.__state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self.__trial:
+                self.__trial = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self.__lock:
+            self.failures = 0
+            self.__opened_at = None
+            self.__trial = False
+
+    def record_failure(self):
+        with self.__lock:
+            self.failures += 1
+            if self.__trial or self.failures >= self.failure_threshold:
+                self.__opened_at = self.clock()
+            self.__trial = False
+
+    def __state(self):
+        if self.__opened_at is None:
+            return CLOSED
+        if self.clock() - self.__opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+
+class CircuitBreakers:
+    # one breaker per endpoint, created on first use
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.breakers = {}
+        self.__lock = threading.Lock()
+
+    def for_endpoint(self, name):
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            with self.__lock:
+                breaker = self.breakers.setdefault(
+                    name, CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock))
+        return breaker
+
+    def states(self):
+        return {name: breaker.state for name, breaker in self.breakers.items()}
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # concurrent calls with the same key share one execution of the function,
+    # the first caller runs it and the others wait for its result
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+
+    def do(self, key, function):
+        with self.__lock:
+            self.calls += 1
+            call = self.__in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self.__in_flight[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        return {'calls': self.calls, 'coalesced': self.coalesced}
+
+
+class AsyncSingleFlight:
+    # asyncio flavour, callers with the same key await one shared task
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self.__in_flight = {}
+
+    async def do(self, key, coroutine_function):
+        self.calls += 1
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = self.__in_flight[key] = asyncio.ensure_future(coroutine_function())
+            task.add_done_callback(lambda _: self.__in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shielded so one cancelled caller does not cancel the others
+        return await asyncio.shield(task)
+
+    def stats(self):
+        return {'calls': self.calls, 'coalesced': self.coalesced}
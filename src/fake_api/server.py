@@ -0,0 +1,301 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+CLIENT_FIELDS = ('email', 'name', 'surname')
+ORDER_FIELDS = ('order_id', 'client_id', 'items')
+
+
+class FakeShopServer:
+    # local stand-in for the https://virtual-shop.pl/api clients and orders
+    # endpoints with an in-memory dataset, for load testing without the real API
+    def __init__(self, host='127.0.0.1', port=0, latency=0, error_rate=0, seed=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.clients = {}
+        self.orders = {}
+        self.order_index = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.__next_client_id = 1
+        self.__next_order_id = 1
+        self.__thread = None
+        self.httpd = ThreadingHTTPServer((host, port), _handler(self))
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://{}:{}/api/clients'.format(host, port)
+
+    @property
+    def orders_url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://{}:{}/api/orders'.format(host, port)
+
+    def start(self):
+        self.__thread = threading.Thread(target=self.httpd.serve_forever, kwargs={'poll_interval': 0.05},
+                                         daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        if self.__thread is not None:
+            self.httpd.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add_client(self, email, name, surname):
+        with self.lock:
+            return self.__insert_client({'email': email, 'name': name, 'surname': surname})
+
+    def add_order(self, client_id, items):
+        with self.lock:
+            order_id = self.__next_order_id
+            self.__put_order({'order_id': order_id, 'client_id': client_id, 'items': items})
+            return order_id
+
+    def populate(self, clients=100, orders_per_client=10, items_per_order=5):
+        for number in range(clients):
+            client_id = self.add_client('client{}@example.com'.format(number), 'Name{}'.format(number),
+                                        'Surname{}'.format(number))
+            for _ in range(orders_per_client):
+                self.add_order(client_id, [{'name': 'item{}'.format(item), 'value': self.random.randint(1, 100)}
+                                           for item in range(items_per_order)])
+
+    def handle(self, method, path, query, body):
+        # returns status code and JSON body for a request
+        with self.lock:
+            self.requests += 1
+            failed = self.error_rate and self.random.random() < self.error_rate
+        if self.latency:
+            delay = self.random.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+            time.sleep(delay)
+        if failed:
+            return 500, {'error': 'Injected error'}
+        for route_method, pattern, route in ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                with self.lock:
+                    return route(self, query, body, *map(int, match.groups()))
+        return 404, {'error': 'Not found'}
+
+    def _list_clients(self, query, body):
+        # copies, responses are encoded after the lock is released
+        clients = [dict(client) for client in self.clients.values()]
+        if 'page_size' in query:
+            page_size = _positive_int(query['page_size'][0])
+            page = _positive_int(query.get('page', ['1'])[0])
+            if page_size is None or page is None:
+                return 400, {'error': 'Page and page_size must be positive integers'}
+            clients = clients[(page - 1) * page_size:page * page_size]
+        return 200, {'results': clients}
+
+    def _add_client(self, query, body):
+        if not isinstance(body, dict) or any(field not in body for field in CLIENT_FIELDS):
+            return 400, {'error': 'Body must contain email, name and surname'}
+        if any(client['email'] == body['email'] for client in self.clients.values()):
+            return 409, {'error': 'User of given email exists'}
+        return 201, {'id': self.__insert_client(body)}
+
+    def __insert_client(self, body):
+        client_id = self.__next_client_id
+        self.__next_client_id += 1
+        self.clients[client_id] = dict({field: body[field] for field in CLIENT_FIELDS}, id=client_id)
+        self.orders[client_id] = []
+        return client_id
+
+    def _get_client(self, query, body, client_id):
+        if client_id not in self.clients:
+            return 404, {'error': 'User does not exist'}
+        return 200, dict(self.clients[client_id])
+
+    def _update_client(self, query, body, client_id):
+        if client_id not in self.clients:
+            return 404, {'error': 'User does not exist'}
+        if not isinstance(body, dict) or any(field not in body for field in CLIENT_FIELDS):
+            return 400, {'error': 'Body must contain email, name and surname'}
+        if any(client['email'] == body['email'] and client['id'] != client_id for client in self.clients.values()):
+            return 409, {'error': 'Email already exists'}
+        self.clients[client_id].update({field: body[field] for field in CLIENT_FIELDS})
+        return 200, {'id': client_id}
+
+    def _delete_client(self, query, body, client_id):
+        if client_id not in self.clients:
+            return 404, {'error': 'User does not exist'}
+        del self.clients[client_id]
+        for order in self.orders.pop(client_id):
+            del self.order_index[order['order_id']]
+        return 200, {'deleted_id': client_id}
+
+    def _get_client_orders(self, query, body, client_id):
+        if client_id not in self.clients:
+            return 404, {'error': 'User does not exist'}
+        return 200, {'orders': [{'order_id': order['order_id'], 'order': order['items']}
+                                for order in self.orders[client_id]]}
+
+    def _get_client_order(self, query, body, client_id, order_id):
+        if client_id not in self.clients:
+            return 404, {'error': 'User does not exist'}
+        for order in self.orders[client_id]:
+            if order['order_id'] == order_id:
+                return 200, {'order': dict(order)}
+        return 404, {'error': 'Order does not exist'}
+
+    def _get_order(self, query, body, order_id):
+        if order_id not in self.order_index:
+            return 404, {'error': 'Order does not exist'}
+        return 200, {'order': dict(self.order_index[order_id])}
+
+    def _put_order(self, query, body, order_id):
+        order = _order_body(body)
+        if order is None or order['order_id'] != order_id:
+            return 400, {'error': 'Body must contain order with order_id, client_id and items'}
+        self.__put_order(order)
+        return 200, {'order_id': order_id}
+
+    def _delete_order(self, query, body, order_id):
+        if self.__remove_order(order_id) is None:
+            return 404, {'error': 'Order does not exist'}
+        return 200, {'deleted_id': order_id}
+
+    def _batch_orders(self, query, body):
+        # operations are validated first, so a bad batch changes nothing
+        operations = body.get('operations') if isinstance(body, dict) else None
+        if not isinstance(operations, list):
+            return 400, {'error': 'Body must contain operations'}
+        changes = []
+        for operation in operations:
+            if not isinstance(operation, dict):
+                return 400, {'error': 'Operation must be put or delete'}
+            order = _order_body(operation) if operation.get('op') == 'put' else None
+            if order is not None:
+                changes.append((self.__put_order, order))
+            elif operation.get('op') == 'delete' and type(operation.get('order_id')) is int:
+                changes.append((self.__remove_order, operation['order_id']))
+            else:
+                return 400, {'error': 'Operation must be put or delete'}
+        for change, argument in changes:
+            change(argument)
+        return 200, {'applied': len(changes)}
+
+    def __put_order(self, order):
+        self.__remove_order(order['order_id'])
+        self.orders.setdefault(order['client_id'], []).append(order)
+        self.order_index[order['order_id']] = order
+        self.__next_order_id = max(self.__next_order_id, order['order_id'] + 1)
+
+    def __remove_order(self, order_id):
+        order = self.order_index.pop(order_id, None)
+        if order is not None:
+            self.orders[order['client_id']].remove(order)
+        return order
+
+
+def _positive_int(value):
+    try:
+        value = int(value)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def _order_body(body):
+    order = body.get('order') if isinstance(body, dict) else None
+    if not isinstance(order, dict) or any(field not in order for field in ORDER_FIELDS):
+        return None
+    if type(order['order_id']) is not int or not isinstance(order['items'], list):
+        return None
+    return {field: order[field] for field in ORDER_FIELDS}
+
+
+ROUTES = [
+    ('GET', re.compile(r'/api/clients'), FakeShopServer._list_clients),
+    ('POST', re.compile(r'/api/clients/add'), FakeShopServer._add_client),
+    ('GET', re.compile(r'/api/clients/(\d+)'), FakeShopServer._get_client),
+    ('PUT', re.compile(r'/api/clients/(\d+)'), FakeShopServer._update_client),
+    ('DELETE', re.compile(r'/api/clients/(\d+)'), FakeShopServer._delete_client),
+    ('GET', re.compile(r'/api/clients/(\d+)/orders'), FakeShopServer._get_client_orders),
+    ('GET', re.compile(r'/api/clients/(\d+)/order/(\d+)'), FakeShopServer._get_client_order),
+    ('POST', re.compile(r'/api/orders/batch'), FakeShopServer._batch_orders),
+    ('GET', re.compile(r'/api/orders/(\d+)'), FakeShopServer._get_order),
+    ('PUT', re.compile(r'/api/orders/(\d+)'), FakeShopServer._put_order),
+    ('DELETE', re.compile(r'/api/orders/(\d+)'), FakeShopServer._delete_order),
+]
+
+
+def _handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.__respond('GET')
+
+        def do_POST(self):
+            self.__respond('POST')
+
+        def do_PUT(self):
+            self.__respond('PUT')
+
+        def do_DELETE(self):
+            self.__respond('DELETE')
+
+        def __respond(self, method):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                body = None
+            url = urlsplit(self.path)
+            status, payload = server.handle(method, url.path.rstrip('/'), parse_qs(url.query), body)
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fake virtual-shop.pl clients API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0, help='seconds added to every response')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of requests answered with 500')
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--orders-per-client', type=int, default=10)
+    parser.add_argument('--items-per-order', type=int, default=5)
+    args = parser.parse_args(argv)
+    server = FakeShopServer(args.host, args.port, args.latency, args.error_rate)
+    server.populate(args.clients, args.orders_per_client, args.items_per_order)
+    print('Serving {} clients on {}'.format(len(server.clients), server.url))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+from abc import ABC
+from order.Order import DELETED, DUPLICATE, INSERTED, MISSING, UPDATED, Order
+from order.OrderModel import OrderModel
+
+
+class AsyncOrder(ABC):
+    def __init__(self, order_repository=None):
+        self.fake_api = 'https://virtual-shop.pl/api/orders'
+        self.order_repository = order_repository
+
+    async def get_order(self, order_id):
+        if type(order_id) is not int:
+            raise TypeError('Order id must be integer')
+        if order_id < 0:
+            raise ValueError('Order id must be greater or equal 0')
+        order = await self.order_repository.find_by_id(order_id)
+        if order:
+            return order
+        return 'Item does not exist'
+
+    async def add_order(self, order):
+        if isinstance(order, OrderModel) is False:
+            raise TypeError('Order is not OrderModel type')
+        return await self.order_repository.add(order)
+
+    async def update_order(self, order_id, new_order):
+        if type(order_id) is not int or isinstance(new_order, OrderModel) is False:
+            raise TypeError('Order is not OrderModel type or order id is not int')
+        if order_id < 0:
+            raise ValueError('Order id must be greater or equal 0')
+        if new_order.order_id != order_id and await self.order_repository.find_by_id(new_order.order_id) is not None:
+            # backends differ here, some would keep the existing order and
+            # others overwrite it, so the old order is never dropped for it
+            raise ValueError('Order id {} already exists'.format(new_order.order_id))
+        return await self.order_repository.update(order_id, new_order)
+
+    async def delete_order(self, order_id):
+        if type(order_id) is not int:
+            raise TypeError('Order id is not integer')
+        if order_id < 0:
+            raise ValueError('Order is must be greater or equal 0')
+        return await self.order_repository.delete_by_id(order_id)
+
+    async def get_orders(self, order_ids):
+        order_ids, positions, results = Order._split(order_ids, Order._valid_order_id)
+        found = await self.order_repository.find_many(order_ids) if order_ids else []
+        return Order._place(results, positions, [order if order else MISSING for order in found])
+
+    async def add_orders(self, orders):
+        orders, positions, results = Order._split(orders, Order._valid_order)
+        added = await self.order_repository.add_many(orders) if orders else []
+        return Order._place(results, positions, [INSERTED if result else DUPLICATE for result in added])
+
+    async def upsert_orders(self, orders):
+        orders, positions, results = Order._split(orders, Order._valid_order)
+        inserted = await self.order_repository.upsert_many(orders) if orders else []
+        return Order._place(results, positions, [INSERTED if result else UPDATED for result in inserted])
+
+    async def delete_orders(self, order_ids):
+        order_ids, positions, results = Order._split(order_ids, Order._valid_order_id)
+        deleted = await self.order_repository.delete_many(order_ids) if order_ids else []
+        return Order._place(results, positions, [DELETED if result else MISSING for result in deleted])
@@ -0,0 +1,98 @@
+import asyncio
+import functools
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncOrderRepository(ABC):
+    @abstractmethod
+    async def find_by_id(self, order_id):
+        pass
+
+    @abstractmethod
+    async def add(self, order):
+        pass
+
+    @abstractmethod
+    async def delete(self, order):
+        pass
+
+    @abstractmethod
+    async def delete_by_id(self, order_id):
+        pass
+
+    @abstractmethod
+    async def upsert(self, order):
+        pass
+
+    @abstractmethod
+    async def update(self, order_id, new_order):
+        pass
+
+    async def find_many(self, order_ids):
+        return [await self.find_by_id(order_id) for order_id in order_ids]
+
+    async def add_many(self, orders):
+        return [await self.add(order) for order in orders]
+
+    async def delete_many(self, order_ids):
+        return [await self.delete_by_id(order_id) for order_id in order_ids]
+
+    async def upsert_many(self, orders):
+        return [await self.upsert(order) for order in orders]
+
+
+class ExecutorOrderRepository(AsyncOrderRepository):
+    # runs a sync repository in a bounded thread pool so its calls do not
+    # block the event loop. One worker by default, most repositories are not
+    # thread-safe, ConcurrentOrderRepository can be given more.
+    def __init__(self, repository, max_workers=1, executor=None):
+        self.repository = repository
+        self.__owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+
+    async def find_by_id(self, order_id):
+        return await self.__run(self.repository.find_by_id, order_id)
+
+    async def add(self, order):
+        return await self.__run(self.repository.add, order)
+
+    async def delete(self, order):
+        return await self.__run(self.repository.delete, order)
+
+    async def delete_by_id(self, order_id):
+        return await self.__run(self.repository.delete_by_id, order_id)
+
+    async def upsert(self, order):
+        return await self.__run(self.repository.upsert, order)
+
+    async def update(self, order_id, new_order):
+        return await self.__run(self.repository.update, order_id, new_order)
+
+    # batches are handed to the sync repository whole, one executor hop each
+
+    async def find_many(self, order_ids):
+        return await self.__run(self.repository.find_many, order_ids)
+
+    async def add_many(self, orders):
+        return await self.__run(self.repository.add_many, orders)
+
+    async def delete_many(self, order_ids):
+        return await self.__run(self.repository.delete_many, order_ids)
+
+    async def upsert_many(self, orders):
+        return await self.__run(self.repository.upsert_many, orders)
+
+    async def find_by_client(self, client_id):
+        return await self.__run(self.repository.find_by_client, client_id)
+
+    async def count_by_client(self, client_id):
+        return await self.__run(self.repository.count_by_client, client_id)
+
+    def close(self):
+        if self.__owns_executor:
+            self.executor.shutdown(wait=True)
+
+    async def __run(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(method, *args))
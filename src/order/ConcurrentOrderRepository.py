@@ -0,0 +1,72 @@
+import threading
+
+from order.OrderRepository import OrderRepository
+
+
+class ConcurrentOrderRepository(OrderRepository):
+    # writes lock only the stripe their order_id hashes to, so operations on
+    # unrelated orders run in parallel. The client index is shared between
+    # stripes and has its own lock, held just for the index updates.
+    def __init__(self, data_source=None, stripes=64):
+        if stripes <= 0:
+            raise ValueError('Number of stripes must be greater than 0')
+        # reentrant, update runs upsert, add and delete under the locks it already holds
+        self.__locks = [threading.RLock() for _ in range(stripes)]
+        self.__client_lock = threading.Lock()
+        super().__init__(data_source)
+
+    def add(self, order):
+        with self.__lock(order.order_id):
+            return super().add(order)
+
+    def delete(self, order):
+        with self.__lock(order.order_id):
+            super().delete(order)
+
+    def delete_by_id(self, order_id):
+        with self.__lock(order_id):
+            return super().delete_by_id(order_id)
+
+    def upsert(self, order):
+        with self.__lock(order.order_id):
+            return super().upsert(order)
+
+    def update(self, order_id, new_order):
+        # both stripes are taken in index order so two updates can not deadlock
+        stripes = sorted({self.__stripe(order_id), self.__stripe(new_order.order_id)})
+        for stripe in stripes:
+            self.__locks[stripe].acquire()
+        try:
+            old_order = self.find_by_id(order_id)
+            if old_order is None:
+                return False
+            # readers take no lock, so the order is replaced in place and a
+            # moved order is added before the old id is dropped, find_by_id
+            # never sees it missing in between
+            if new_order.order_id == order_id:
+                self.upsert(new_order)
+            else:
+                self.add(new_order)
+                self.delete(old_order)
+            return True
+        finally:
+            for stripe in reversed(stripes):
+                self.__locks[stripe].release()
+
+    def find_by_client(self, client_id):
+        with self.__client_lock:
+            return super().find_by_client(client_id)
+
+    def _index_client(self, order):
+        with self.__client_lock:
+            super()._index_client(order)
+
+    def _unindex_client(self, order_id):
+        with self.__client_lock:
+            super()._unindex_client(order_id)
+
+    def __stripe(self, order_id):
+        return hash(order_id) % len(self.__locks)
+
+    def __lock(self, order_id):
+        return self.__locks[self.__stripe(order_id)]
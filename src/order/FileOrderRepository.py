@@ -0,0 +1,300 @@
+import json
+import mmap
+import os
+import struct
+
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderRepository
+
+PUT = 1
+DELETE = 2
+# set on the operation of records whose client is not a 64-bit integer, that
+# client is only found in the payload
+PAYLOAD_CLIENT = 0x80
+# operation, order id, client, payload length
+RECORD_HEADER = struct.Struct('<BqqI')
+INDEX_MAGIC = b'OIX2'
+# format marker, log length covered by the index file
+INDEX_HEADER = struct.Struct('<4sQ')
+# order id, record offset, payload client flag, client
+INDEX_ENTRY = struct.Struct('<qQBq')
+
+
+class FileOrderRepository(OrderRepository):
+    # orders are kept in an append-only log, only the order_id -> offset and
+    # client indexes live in memory and records are decoded on demand from a
+    # memory map of the log. Record headers carry the client, so both indexes
+    # are rebuilt without parsing payloads. They are saved next to the log on
+    # close, so opening a large store reads the index file and the headers of
+    # records appended after it only.
+    def __init__(self, path, sync=False):
+        self.path = path
+        self.index_path = path + '.idx'
+        self.sync = sync
+        self.__offsets = {}
+        self.__file = open(path, 'a+b')
+        self.__size = os.path.getsize(path)
+        self.__map = None
+        self.__clients = {}
+        self.__by_client = {}
+        self.__load_index()
+
+    def find_by_id(self, order_id):
+        offset = self.__offsets.get(order_id)
+        if offset is None:
+            return None
+        return self.__read(offset)
+
+    def add(self, order):
+        if order.order_id in self.__offsets:
+            return False
+        self.__append([self.__put_record(order)])
+        return True
+
+    def delete(self, order):
+        if not self.delete_by_id(order.order_id):
+            raise ValueError('Order is not in repository')
+
+    def delete_by_id(self, order_id):
+        if order_id not in self.__offsets:
+            return False
+        self.__append([self.__delete_record(order_id)])
+        return True
+
+    def upsert(self, order):
+        inserted = order.order_id not in self.__offsets
+        self.__append([self.__put_record(order)])
+        return inserted
+
+    def update(self, order_id, new_order):
+        if order_id not in self.__offsets:
+            return False
+        records = [self.__delete_record(order_id)]
+        if new_order.order_id == order_id or new_order.order_id not in self.__offsets:
+            records.append(self.__put_record(new_order))
+        self.__append(records)
+        return True
+
+    def add_many(self, orders):
+        # the whole batch is written and flushed once
+        results, records, seen = [], [], set()
+        for order in orders:
+            added = order.order_id not in self.__offsets and order.order_id not in seen
+            if added:
+                seen.add(order.order_id)
+                records.append(self.__put_record(order))
+            results.append(added)
+        self.__append(records)
+        return results
+
+    def upsert_many(self, orders):
+        results, records, seen = [], [], set()
+        for order in orders:
+            results.append(order.order_id not in self.__offsets and order.order_id not in seen)
+            seen.add(order.order_id)
+            records.append(self.__put_record(order))
+        self.__append(records)
+        return results
+
+    def delete_many(self, order_ids):
+        results, records, seen = [], [], set()
+        for order_id in order_ids:
+            deleted = order_id in self.__offsets and order_id not in seen
+            if deleted:
+                seen.add(order_id)
+                records.append(self.__delete_record(order_id))
+            results.append(deleted)
+        self.__append(records)
+        return results
+
+    def find_by_client(self, client_id):
+        return [self.__read(self.__offsets[order_id]) for order_id in self.__by_client.get(client_id, ())]
+
+    def count_by_client(self, client_id):
+        return len(self.__by_client.get(client_id, ()))
+
+    @property
+    def data_source(self):
+        return list(self.iter_orders())
+
+    def iter_orders(self):
+        # records are decoded one at a time, only the offsets are copied
+        for offset in list(self.__offsets.values()):
+            yield self.__read(offset)
+
+    def compact(self):
+        # rewrites the log with live records only
+        tmp_path = self.path + '.tmp'
+        offsets = {}
+        with open(tmp_path, 'wb') as tmp:
+            position = 0
+            for order_id, offset in self.__offsets.items():
+                record = self.__raw(offset)
+                tmp.write(record)
+                offsets[order_id] = position
+                position += len(record)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        self.__close_files()
+        # the old index must not outlive the log it points into
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+        os.replace(tmp_path, self.path)
+        self.__file = open(self.path, 'a+b')
+        self.__size = position
+        self.__offsets = offsets
+        self.save_index()
+
+    def save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'wb') as index:
+            index.write(INDEX_HEADER.pack(INDEX_MAGIC, self.__size))
+            index.write(b''.join(INDEX_ENTRY.pack(order_id, offset, *_header_client(self.__clients[order_id]))
+                                 for order_id, offset in self.__offsets.items()))
+        os.replace(tmp_path, self.index_path)
+
+    def close(self):
+        if self.__file is None:
+            return
+        self.save_index()
+        self.__close_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __load_index(self):
+        start = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'rb') as index:
+                data = index.read()
+            if len(data) >= INDEX_HEADER.size:
+                magic, covered = INDEX_HEADER.unpack_from(data)
+                # an index saved for a longer log than the current one is stale
+                if magic == INDEX_MAGIC and covered <= self.__size:
+                    for order_id, offset, flag, client in INDEX_ENTRY.iter_unpack(data[INDEX_HEADER.size:]):
+                        self.__offsets[order_id] = offset
+                        self.__index_client(order_id, self.__read(offset).client if flag else client)
+                    start = covered
+        self.__replay(start)
+
+    def __replay(self, offset):
+        # only headers are read, payloads are skipped unless the client is
+        # not a 64-bit integer
+        view = self.__view()
+        while offset + RECORD_HEADER.size <= self.__size:
+            operation, order_id, client, length = RECORD_HEADER.unpack_from(view, offset)
+            if offset + RECORD_HEADER.size + length > self.__size:
+                break
+            if order_id in self.__offsets:
+                self.__unindex_client(order_id)
+                del self.__offsets[order_id]
+            if operation & ~PAYLOAD_CLIENT == PUT:
+                self.__offsets[order_id] = offset
+                self.__index_client(order_id, self.__read(offset).client if operation & PAYLOAD_CLIENT else client)
+            offset += RECORD_HEADER.size + length
+        if offset < self.__size:
+            # a record torn by a crash is dropped so new ones follow the last good one
+            if self.__map is not None:
+                self.__map.close()
+                self.__map = None
+            self.__file.truncate(offset)
+            self.__size = offset
+
+    def __view(self):
+        if self.__size == 0:
+            return b''
+        if self.__map is None or len(self.__map) < self.__size:
+            if self.__map is not None:
+                self.__map.close()
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.__map
+
+    def __read(self, offset):
+        view = self.__view()
+        _, order_id, _, length = RECORD_HEADER.unpack_from(view, offset)
+        start = offset + RECORD_HEADER.size
+        payload = json.loads(view[start:start + length].decode('utf-8'))
+        return OrderModel(order_id, payload['client'], payload['items'])
+
+    def __raw(self, offset):
+        view = self.__view()
+        _, _, _, length = RECORD_HEADER.unpack_from(view, offset)
+        return view[offset:offset + RECORD_HEADER.size + length]
+
+    def __append(self, records):
+        if not records:
+            return
+        # every record is checked and packed before anything is written, and
+        # the indexes change only once the whole batch is in the log, so a bad
+        # record leaves the store as it was
+        chunks, offsets = [], []
+        offset = self.__size
+        for operation, order_id, payload, client in records:
+            if not _is_int64(order_id):
+                raise TypeError('Order id must be integer')
+            hash(client)
+            flag, header_client = _header_client(client) if operation == PUT else (0, 0)
+            chunks.append(RECORD_HEADER.pack(operation | flag, order_id, header_client, len(payload)))
+            chunks.append(payload)
+            offsets.append(offset)
+            offset += RECORD_HEADER.size + len(payload)
+        try:
+            self.__file.write(b''.join(chunks))
+            self.__file.flush()
+            if self.sync:
+                os.fsync(self.__file.fileno())
+        except OSError:
+            # a partly written batch is cut off so the next one follows the last good record
+            self.__file.truncate(self.__size)
+            raise
+        for (operation, order_id, _, client), record_offset in zip(records, offsets):
+            if order_id in self.__offsets:
+                self.__unindex_client(order_id)
+            if operation == PUT:
+                self.__offsets[order_id] = record_offset
+                self.__index_client(order_id, client)
+            else:
+                del self.__offsets[order_id]
+        self.__size = offset
+
+    @staticmethod
+    def __put_record(order):
+        payload = json.dumps({'client': order.client, 'items': order.items},
+                             separators=(',', ':')).encode('utf-8')
+        return PUT, order.order_id, payload, order.client
+
+    @staticmethod
+    def __delete_record(order_id):
+        return DELETE, order_id, b'', None
+
+    def __index_client(self, order_id, client):
+        self.__clients[order_id] = client
+        self.__by_client.setdefault(client, {})[order_id] = None
+
+    def __unindex_client(self, order_id):
+        client = self.__clients.pop(order_id)
+        order_ids = self.__by_client[client]
+        del order_ids[order_id]
+        if not order_ids:
+            del self.__by_client[client]
+
+    def __close_files(self):
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        self.__file.close()
+        self.__file = None
+
+
+def _is_int64(value):
+    return type(value) is int and -2 ** 63 <= value < 2 ** 63
+
+
+def _header_client(client):
+    # payload client flag and the client stored in headers and index entries
+    if _is_int64(client):
+        return 0, client
+    return PAYLOAD_CLIENT, 0
@@ -1,6 +1,15 @@
 from abc import ABC
 from order.OrderModel import OrderModel
 
+# per-item results of the batch methods
+INSERTED = 'inserted'
+UPDATED = 'updated'
+DUPLICATE = 'duplicate'
+DELETED = 'deleted'
+MISSING = 'missing'
+INVALID = 'invalid'
+
+
 class Order(ABC):
     def __init__(self, order_repository=None):
         self.fake_api = 'https://virtual-shop.pl/api/orders'
@@ -11,10 +20,10 @@ class Order(ABC):
             raise TypeError('Order id must be integer')
         if order_id < 0:
             raise ValueError('Order id must be greater or equal 0')
-        if self.order_repository.find_by_id(order_id):
-            return self.order_repository.find_by_id(order_id)
-        else:
-            return 'Item does not exist'
+        order = self.order_repository.find_by_id(order_id)
+        if order:
+            return order
+        return 'Item does not exist'
 
     def add_order(self, order):
         if isinstance(order, OrderModel) is False:
@@ -26,6 +35,10 @@ class Order(ABC):
             raise TypeError('Order is not OrderModel type or order id is not int')
         if order_id < 0:
             raise ValueError('Order id must be greater or equal 0')
+        if new_order.order_id != order_id and self.order_repository.find_by_id(new_order.order_id) is not None:
+            # backends differ here, some would keep the existing order and
+            # others overwrite it, so the old order is never dropped for it
+            raise ValueError('Order id {} already exists'.format(new_order.order_id))
         return self.order_repository.update(order_id, new_order)
 
     def delete_order(self, order_id):
@@ -33,7 +46,46 @@ class Order(ABC):
             raise TypeError('Order id is not integer')
         if order_id < 0:
             raise ValueError('Order is must be greater or equal 0')
-        if self.order_repository.find_by_id(order_id):
-            self.order_repository.delete(self.order_repository.find_by_id(order_id))
-            return True
-        return False
+        return self.order_repository.delete_by_id(order_id)
+
+    def get_orders(self, order_ids):
+        order_ids, positions, results = self._split(order_ids, self._valid_order_id)
+        found = self.order_repository.find_many(order_ids) if order_ids else []
+        return self._place(results, positions, [order if order else MISSING for order in found])
+
+    def add_orders(self, orders):
+        orders, positions, results = self._split(orders, self._valid_order)
+        added = self.order_repository.add_many(orders) if orders else []
+        return self._place(results, positions, [INSERTED if result else DUPLICATE for result in added])
+
+    def upsert_orders(self, orders):
+        orders, positions, results = self._split(orders, self._valid_order)
+        inserted = self.order_repository.upsert_many(orders) if orders else []
+        return self._place(results, positions, [INSERTED if result else UPDATED for result in inserted])
+
+    def delete_orders(self, order_ids):
+        order_ids, positions, results = self._split(order_ids, self._valid_order_id)
+        deleted = self.order_repository.delete_many(order_ids) if order_ids else []
+        return self._place(results, positions, [DELETED if result else MISSING for result in deleted])
+
+    @staticmethod
+    def _valid_order_id(order_id):
+        return type(order_id) is int and order_id >= 0
+
+    @staticmethod
+    def _valid_order(order):
+        return isinstance(order, OrderModel)
+
+    @staticmethod
+    def _split(items, valid):
+        # invalid entries are reported in place as INVALID, the valid ones
+        # still go to the repository in a single call
+        items = list(items)
+        positions = [index for index, item in enumerate(items) if valid(item)]
+        return [items[index] for index in positions], positions, [INVALID] * len(items)
+
+    @staticmethod
+    def _place(results, positions, outcomes):
+        for index, outcome in zip(positions, outcomes):
+            results[index] = outcome
+        return results
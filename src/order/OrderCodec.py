@@ -0,0 +1,124 @@
+import json
+import struct
+from itertools import islice
+
+from order.OrderModel import OrderModel
+
+# binary record: order id, client id, number of items, then per item the
+# name length, name, value type and value
+RECORD_LENGTH = struct.Struct('<I')
+RECORD_HEADER = struct.Struct('<qqI')
+NAME_LENGTH = struct.Struct('<H')
+INT_VALUE = struct.Struct('<Bq')
+FLOAT_VALUE = struct.Struct('<Bd')
+INT, FLOAT = 0, 1
+
+_encoder = json.JSONEncoder(separators=(',', ':'))
+_decode = json.JSONDecoder().decode
+
+
+def to_dict(order):
+    return {'order': {'items': order.items, 'order_id': order.order_id, 'client_id': order.client}}
+
+
+def from_dict(data):
+    order = data['order']
+    return OrderModel(order['order_id'], order['client_id'], order['items'])
+
+
+def to_dicts(orders):
+    return [{'order': {'items': order.items, 'order_id': order.order_id, 'client_id': order.client}}
+            for order in orders]
+
+
+def from_dicts(dicts):
+    return [OrderModel(order['order_id'], order['client_id'], order['items'])
+            for order in (data['order'] for data in dicts)]
+
+
+def write_ndjson(orders, output, chunk_size=1000):
+    # lines are joined in chunks so the file gets one write per chunk
+    orders = iter(orders)
+    encode = _encoder.encode
+    written = 0
+    while True:
+        chunk = list(islice(orders, chunk_size))
+        if not chunk:
+            return written
+        output.write(''.join([encode(data) + '\n' for data in to_dicts(chunk)]))
+        written += len(chunk)
+
+
+def read_ndjson(lines):
+    for line in lines:
+        if line.strip():
+            yield from_dict(_decode(line))
+
+
+def pack(order):
+    if not _is_int64(order.order_id) or not _is_int64(order.client):
+        raise ValueError('Binary encoding needs 64-bit integer order and client ids')
+    items = order.items or []
+    parts = [RECORD_HEADER.pack(order.order_id, order.client, len(items))]
+    for item in items:
+        if not isinstance(item, dict) or set(item) != {'name', 'value'}:
+            raise ValueError('Binary encoding supports items with name and value only')
+        if not isinstance(item['name'], str):
+            raise ValueError('Binary encoding needs string item names')
+        name = item['name'].encode('utf-8')
+        if len(name) > 0xFFFF:
+            raise ValueError('Item name is too long for binary encoding')
+        parts.append(NAME_LENGTH.pack(len(name)))
+        parts.append(name)
+        value = item['value']
+        # bool is an int subclass, it is rejected rather than decoded as a number
+        if _is_int64(value):
+            parts.append(INT_VALUE.pack(INT, value))
+        elif type(value) is float:
+            parts.append(FLOAT_VALUE.pack(FLOAT, value))
+        else:
+            raise ValueError('Binary encoding supports 64-bit integer and float item values only')
+    return b''.join(parts)
+
+
+def _is_int64(value):
+    return type(value) is int and -2 ** 63 <= value < 2 ** 63
+
+
+def unpack(data):
+    order_id, client, count = RECORD_HEADER.unpack_from(data)
+    offset = RECORD_HEADER.size
+    items = []
+    for _ in range(count):
+        length, = NAME_LENGTH.unpack_from(data, offset)
+        offset += NAME_LENGTH.size
+        name = bytes(data[offset:offset + length]).decode('utf-8')
+        offset += length
+        value_type, value = (INT_VALUE if data[offset] == INT else FLOAT_VALUE).unpack_from(data, offset)
+        offset += INT_VALUE.size
+        items.append({'name': name, 'value': value})
+    return OrderModel(order_id, client, items)
+
+
+def write_binary(orders, output):
+    written = 0
+    for order in orders:
+        record = pack(order)
+        output.write(RECORD_LENGTH.pack(len(record)))
+        output.write(record)
+        written += 1
+    return written
+
+
+def read_binary(stream):
+    while True:
+        header = stream.read(RECORD_LENGTH.size)
+        if not header:
+            return
+        if len(header) < RECORD_LENGTH.size:
+            raise ValueError('Truncated binary order stream')
+        length, = RECORD_LENGTH.unpack(header)
+        record = stream.read(length)
+        if len(record) < length:
+            raise ValueError('Truncated binary order stream')
+        yield unpack(record)
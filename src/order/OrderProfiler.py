@@ -0,0 +1,148 @@
+import functools
+import sys
+import threading
+import time
+
+SERVICE_METHODS = ('get_order', 'add_order', 'update_order', 'delete_order',
+                   'get_orders', 'add_orders', 'upsert_orders', 'delete_orders')
+# repository methods taking a batch as their first argument
+BATCH_METHODS = ('find_many', 'add_many', 'delete_many', 'upsert_many')
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class OperationStats:
+    def __init__(self):
+        self.latencies = []
+        self.items = 0
+        self.repository_calls = 0
+
+    @property
+    def calls(self):
+        return len(self.latencies)
+
+
+class ProfiledOrderRepository:
+    # proxy recording calls, latency and number of orders touched for every
+    # repository method, works with any repository
+    def __init__(self, repository, profiler=None):
+        self.repository = repository
+        self.profiler = profiler or OrderProfiler()
+
+    def __getattr__(self, name):
+        attribute = getattr(self.repository, name)
+        if not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def profiled(*args, **kwargs):
+            if name in BATCH_METHODS and args:
+                args = (list(args[0]),) + args[1:]
+            started = time.perf_counter()
+            result = attribute(*args, **kwargs)
+            elapsed = time.perf_counter() - started
+            self.profiler.record_repository_call(name, elapsed, _items(name, args, result))
+            return result
+
+        return profiled
+
+    @property
+    def data_source(self):
+        started = time.perf_counter()
+        orders = self.repository.data_source
+        self.profiler.record_repository_call('data_source', time.perf_counter() - started, len(orders))
+        return orders
+
+
+class OrderProfiler:
+    # wraps an Order service so each call records its latency and how many
+    # repository calls it made, Order itself is left unchanged
+    def __init__(self, order=None):
+        self.service = {}
+        self.repository = {}
+        self.__order = None
+        self.__lock = threading.Lock()
+        self.__current = threading.local()
+        if order is not None:
+            self.attach(order)
+
+    def attach(self, order):
+        self.__order = order
+        self.__original_repository = order.order_repository
+        order.order_repository = ProfiledOrderRepository(order.order_repository, self)
+        for name in SERVICE_METHODS:
+            if hasattr(order, name):
+                setattr(order, name, self.__wrap(name, getattr(order, name)))
+        return order
+
+    def detach(self):
+        if self.__order is None:
+            return
+        for name in SERVICE_METHODS:
+            self.__order.__dict__.pop(name, None)
+        self.__order.order_repository = self.__original_repository
+        self.__order = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
+
+    def record_repository_call(self, name, seconds, items):
+        with self.__lock:
+            stats = self.repository.setdefault(name, OperationStats())
+            stats.latencies.append(seconds)
+            stats.items += items
+        # attributed to the service call running on this thread, if any
+        counter = getattr(self.__current, 'calls', None)
+        if counter is not None:
+            counter[0] += 1
+
+    def summary(self):
+        lines = ['{:<28} {:>8} {:>12} {:>10} {:>10} {:>10}'.format(
+            'operation', 'calls', 'repo/call', 'p50 ms', 'p90 ms', 'p99 ms')]
+        for prefix, table, column in (('order', self.service, 'repository_calls'),
+                                      ('repository', self.repository, 'items')):
+            for name, stats in sorted(table.items()):
+                lines.append('{:<28} {:>8} {:>12.2f} {:>10.3f} {:>10.3f} {:>10.3f}'.format(
+                    '{}.{}'.format(prefix, name), stats.calls, getattr(stats, column) / stats.calls,
+                    percentile(stats.latencies, 0.5) * 1000, percentile(stats.latencies, 0.9) * 1000,
+                    percentile(stats.latencies, 0.99) * 1000))
+        lines.append('repo/call is repository calls per service call for order rows '
+                     'and orders touched per call for repository rows')
+        return '\n'.join(lines)
+
+    def dump(self, output=None):
+        (output or sys.stdout).write(self.summary() + '\n')
+
+    def __wrap(self, name, method):
+        @functools.wraps(method)
+        def profiled(*args, **kwargs):
+            outer = getattr(self.__current, 'calls', None)
+            self.__current.calls = counter = [0]
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.__current.calls = outer
+                with self.__lock:
+                    stats = self.service.setdefault(name, OperationStats())
+                    stats.latencies.append(elapsed)
+                    stats.repository_calls += counter[0]
+
+        return profiled
+
+
+def _items(name, args, result):
+    if name in BATCH_METHODS and args:
+        return len(args[0])
+    if name == 'find_by_client' and result is not None:
+        return len(result)
+    return 1
@@ -1,21 +1,64 @@
 from abc import ABC
 
 
+class OrderListingError(Exception):
+    # raised by repositories whose store can not list every order
+    pass
+
+
 class OrderRepository(ABC):
-    def __init__(self, data_source=[]):
-        self.__data_source = data_source
+    def __init__(self, data_source=None):
+        # orders are indexed by order_id, dict keeps insertion order so
+        # data_source still lists them the way they were added
+        self.__orders = {}
+        # client -> order ids, inner dicts are used as ordered sets. The client
+        # each order is indexed under is kept as well, orders are mutable and
+        # may have been changed in place before they are updated
+        self.__by_client = {}
+        self.__clients = {}
+        for order in data_source or []:
+            self.add(order)
 
     def find_by_id(self, order_id):
-        return next((order for order in self.data_source if order.order_id == order_id), None)
+        return self.__orders.get(order_id)
 
     def add(self, order):
-        if not self.find_by_id(order.order_id):
-            self.__data_source.append(order)
-            return True
-        return False
+        if order.order_id in self.__orders:
+            return False
+        # the client index needs a hashable client, checked before anything
+        # changes so a bad order is not left stored but unindexed
+        hash(order.client)
+        self.__orders[order.order_id] = order
+        self._index_client(order)
+        return True
 
     def delete(self, order):
-        self.__data_source.remove(order)
+        if self.__orders.get(order.order_id) is not order:
+            raise ValueError('Order is not in repository')
+        self.delete_by_id(order.order_id)
+
+    def delete_by_id(self, order_id):
+        if order_id not in self.__orders:
+            return False
+        # unindexed first, so the client index never points at a missing order
+        self._unindex_client(order_id)
+        del self.__orders[order_id]
+        return True
+
+    def upsert(self, order):
+        hash(order.client)
+        inserted = order.order_id not in self.__orders
+        if not inserted:
+            self._unindex_client(order.order_id)
+        self.__orders[order.order_id] = order
+        self._index_client(order)
+        return inserted
+
+    def find_by_client(self, client_id):
+        return [self.__orders[order_id] for order_id in self.__by_client.get(client_id, ())]
+
+    def count_by_client(self, client_id):
+        return len(self.__by_client.get(client_id, ()))
 
     def update(self, order_id, new_order):
         old_order = self.find_by_id(order_id)
@@ -25,6 +68,33 @@ class OrderRepository(ABC):
         self.add(new_order)
         return True
 
+    def find_many(self, order_ids):
+        return [self.find_by_id(order_id) for order_id in order_ids]
+
+    def add_many(self, orders):
+        return [self.add(order) for order in orders]
+
+    def delete_many(self, order_ids):
+        return [self.delete_by_id(order_id) for order_id in order_ids]
+
+    def upsert_many(self, orders):
+        return [self.upsert(order) for order in orders]
+
     @property
     def data_source(self):
-        return self.__data_source
+        return list(self.__orders.values())
+
+    def iter_orders(self):
+        # backends keeping orders outside memory stream them instead
+        return iter(self.data_source)
+
+    def _index_client(self, order):
+        self.__clients[order.order_id] = order.client
+        self.__by_client.setdefault(order.client, {})[order.order_id] = None
+
+    def _unindex_client(self, order_id):
+        client = self.__clients.pop(order_id)
+        order_ids = self.__by_client[client]
+        del order_ids[order_id]
+        if not order_ids:
+            del self.__by_client[client]
@@ -0,0 +1,111 @@
+import requests
+
+from client.cache import MISSING, ResponseCache
+from order import OrderCodec
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderListingError, OrderRepository
+
+
+class RemoteOrderRepository(OrderRepository):
+    # orders live behind the remote orders API. find_by_id reads through an
+    # LRU cache with TTL, orders found missing are cached as None for
+    # negative_ttl seconds so repeated lookups of absent ids stay local.
+    # Writes drop the cached entry, go to the API and then cache the result,
+    # so a failed write leaves no stale copy behind. Orders of a client come
+    # from the clients API, there is no endpoint listing every order, so
+    # data_source raises OrderListingError.
+    def __init__(self, url='https://virtual-shop.pl/api/orders', cache=None, negative_ttl=5, session=None,
+                 timeout=10, clients_url='https://virtual-shop.pl/api/clients'):
+        self.url = url
+        self.clients_url = clients_url
+        self.cache = cache if cache is not None else ResponseCache(max_size=10000, ttl=60)
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.__owns_session = session is None
+
+    def find_by_id(self, order_id):
+        order = self.cache.get(order_id)
+        if order is MISSING:
+            order = self.__fetch(order_id)
+            self.__cache(order_id, order)
+        return order
+
+    def add(self, order):
+        if self.find_by_id(order.order_id) is not None:
+            return False
+        self.__put(order)
+        return True
+
+    def delete(self, order):
+        if not self.delete_by_id(order.order_id):
+            raise ValueError('Order is not in repository')
+
+    def delete_by_id(self, order_id):
+        self.cache.invalidate(order_id)
+        response = self.session.delete('{}/{}'.format(self.url, order_id), timeout=self.timeout)
+        if response.status_code != 404:
+            response.raise_for_status()
+        self.__cache(order_id, None)
+        return response.status_code != 404
+
+    def upsert(self, order):
+        inserted = self.find_by_id(order.order_id) is None
+        self.__put(order)
+        return inserted
+
+    def update(self, order_id, new_order):
+        if self.find_by_id(order_id) is None:
+            return False
+        if new_order.order_id != order_id:
+            self.delete_by_id(order_id)
+        self.__put(new_order)
+        return True
+
+    def find_by_client(self, client_id):
+        # read through the clients API, every order returned is cached
+        response = self.session.get('{}/{}/orders'.format(self.clients_url, client_id), timeout=self.timeout)
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        orders = [OrderModel(order['order_id'], client_id, order['order']) for order in response.json()['orders']]
+        for order in orders:
+            self.__cache(order.order_id, order)
+        return orders
+
+    def count_by_client(self, client_id):
+        return len(self.find_by_client(client_id))
+
+    @property
+    def data_source(self):
+        raise OrderListingError('Remote orders API can not list every order')
+
+    def invalidate(self, order_id):
+        self.cache.invalidate(order_id)
+
+    def close(self):
+        if self.__owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __fetch(self, order_id):
+        response = self.session.get('{}/{}'.format(self.url, order_id), timeout=self.timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return OrderCodec.from_dict(response.json())
+
+    def __put(self, order):
+        self.cache.invalidate(order.order_id)
+        response = self.session.put('{}/{}'.format(self.url, order.order_id), json=OrderCodec.to_dict(order),
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        self.__cache(order.order_id, order)
+
+    def __cache(self, order_id, order):
+        self.cache.set(order_id, order, ttl=self.negative_ttl if order is None else None)
@@ -0,0 +1,121 @@
+import json
+import sqlite3
+
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderRepository
+
+# statements are constant strings so sqlite3 keeps them prepared in its
+# statement cache
+CREATE_TABLE = 'CREATE TABLE IF NOT EXISTS orders (' \
+               'order_id INTEGER PRIMARY KEY, client, items TEXT NOT NULL)'
+CREATE_CLIENT_INDEX = 'CREATE INDEX IF NOT EXISTS orders_client ON orders (client)'
+SELECT_ORDER = 'SELECT order_id, client, items FROM orders WHERE order_id = ?'
+SELECT_ORDERS = 'SELECT order_id, client, items FROM orders ORDER BY order_id'
+SELECT_CLIENT_ORDERS = 'SELECT order_id, client, items FROM orders WHERE client = ? ORDER BY order_id'
+COUNT_CLIENT_ORDERS = 'SELECT COUNT(*) FROM orders WHERE client = ?'
+EXISTS_ORDER = 'SELECT 1 FROM orders WHERE order_id = ?'
+INSERT_ORDER = 'INSERT OR IGNORE INTO orders (order_id, client, items) VALUES (?, ?, ?)'
+REPLACE_ORDER = 'INSERT OR REPLACE INTO orders (order_id, client, items) VALUES (?, ?, ?)'
+DELETE_ORDER = 'DELETE FROM orders WHERE order_id = ?'
+
+
+class SqliteOrderRepository(OrderRepository):
+    def __init__(self, path=':memory:', check_same_thread=True):
+        self.path = path
+        # check_same_thread=False lets a single worker thread other than the
+        # creating one use the connection, e.g. ExecutorOrderRepository
+        self.connection = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute(CREATE_TABLE)
+            self.connection.execute(CREATE_CLIENT_INDEX)
+
+    def find_by_id(self, order_id):
+        row = self.connection.execute(SELECT_ORDER, (order_id,)).fetchone()
+        return None if row is None else self.__order(row)
+
+    def add(self, order):
+        with self.connection:
+            return self.__add(order)
+
+    def delete(self, order):
+        if not self.delete_by_id(order.order_id):
+            raise ValueError('Order is not in repository')
+
+    def delete_by_id(self, order_id):
+        with self.connection:
+            return self.__delete(order_id)
+
+    def upsert(self, order):
+        with self.connection:
+            return self.__upsert(order)
+
+    def update(self, order_id, new_order):
+        with self.connection:
+            if not self.__delete(order_id):
+                return False
+            self.__add(new_order)
+            return True
+
+    # each batch runs in a single transaction, so it is committed once
+
+    def add_many(self, orders):
+        with self.connection:
+            return [self.__add(order) for order in orders]
+
+    def delete_many(self, order_ids):
+        with self.connection:
+            return [self.__delete(order_id) for order_id in order_ids]
+
+    def upsert_many(self, orders):
+        with self.connection:
+            return [self.__upsert(order) for order in orders]
+
+    def find_by_client(self, client_id):
+        return [self.__order(row) for row in self.connection.execute(SELECT_CLIENT_ORDERS, (client_id,))]
+
+    def count_by_client(self, client_id):
+        return self.connection.execute(COUNT_CLIENT_ORDERS, (client_id,)).fetchone()[0]
+
+    @property
+    def data_source(self):
+        return list(self.iter_orders())
+
+    def iter_orders(self):
+        # rows are fetched from the cursor as the caller iterates
+        for row in self.connection.execute(SELECT_ORDERS):
+            yield self.__order(row)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __add(self, order):
+        return self.connection.execute(INSERT_ORDER, self.__row(order)).rowcount == 1
+
+    def __delete(self, order_id):
+        return self.connection.execute(DELETE_ORDER, (order_id,)).rowcount == 1
+
+    def __upsert(self, order):
+        row = self.__row(order)
+        inserted = self.connection.execute(EXISTS_ORDER, (order.order_id,)).fetchone() is None
+        self.connection.execute(REPLACE_ORDER, row)
+        return inserted
+
+    @staticmethod
+    def __row(order):
+        # order_id is the rowid, sqlite would assign one for None and reject
+        # other types with its own error
+        if type(order.order_id) is not int:
+            raise TypeError('Order id must be integer')
+        return order.order_id, order.client, json.dumps(order.items, separators=(',', ':'))
+
+    @staticmethod
+    def __order(row):
+        return OrderModel(row[0], row[1], json.loads(row[2]))
@@ -0,0 +1,179 @@
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+import requests
+
+from order import OrderCodec
+from order.Order import DELETED, INSERTED, INVALID, Order
+
+PUT = 'put'
+DELETE = 'delete'
+
+
+class WriteBehindOrder(Order):
+    # writes are applied to the repository at once and queued for the remote
+    # orders API. Pending changes are keyed by order_id, so repeated writes to
+    # one order collapse into the latest, and a background thread sends them
+    # to fake_api + '/batch' once batch_size are pending or every
+    # flush_interval seconds. Writers block while max_pending changes wait.
+    def __init__(self, order_repository=None, batch_size=100, flush_interval=1.0, max_pending=10000,
+                 session=None, timeout=10):
+        super().__init__(order_repository)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.__owns_session = session is None
+        self.pending = OrderedDict()
+        self.last_error = None
+        self.writes = 0
+        self.collapsed = 0
+        self.batches = 0
+        self.sent = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+        # held while a batch is taken and sent, keeps batches in order
+        self.__sending = threading.Lock()
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def add_order(self, order):
+        self.__check_open()
+        added = super().add_order(order)
+        if added is not False:
+            self.__enqueue([(order.order_id, (PUT, order))])
+        return added
+
+    def update_order(self, order_id, new_order):
+        self.__check_open()
+        updated = super().update_order(order_id, new_order)
+        if updated is not False:
+            changes = [(new_order.order_id, (PUT, new_order))]
+            if new_order.order_id != order_id:
+                changes.insert(0, (order_id, (DELETE, None)))
+            self.__enqueue(changes)
+        return updated
+
+    def delete_order(self, order_id):
+        self.__check_open()
+        deleted = super().delete_order(order_id)
+        if deleted is not False:
+            self.__enqueue([(order_id, (DELETE, None))])
+        return deleted
+
+    def add_orders(self, orders):
+        self.__check_open()
+        orders = list(orders)
+        results = super().add_orders(orders)
+        self.__enqueue([(order.order_id, (PUT, order)) for order, result in zip(orders, results) if result == INSERTED])
+        return results
+
+    def upsert_orders(self, orders):
+        self.__check_open()
+        orders = list(orders)
+        results = super().upsert_orders(orders)
+        self.__enqueue([(order.order_id, (PUT, order)) for order, result in zip(orders, results) if result != INVALID])
+        return results
+
+    def delete_orders(self, order_ids):
+        self.__check_open()
+        order_ids = list(order_ids)
+        results = super().delete_orders(order_ids)
+        self.__enqueue([(order_id, (DELETE, None)) for order_id, result in zip(order_ids, results) if result == DELETED])
+        return results
+
+    def flush(self):
+        # sends everything pending from the calling thread, a failed batch is
+        # put back in front of the queue and its error raised
+        with self.__sending:
+            while self.__send_batch():
+                pass
+
+    def close(self):
+        with self.__condition:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        try:
+            self.flush()
+        finally:
+            if self.__owns_session:
+                self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def stats(self):
+        return {'writes': self.writes, 'collapsed': self.collapsed, 'batches': self.batches,
+                'sent': self.sent, 'pending': len(self.pending)}
+
+    def __check_open(self):
+        if self.__closed:
+            raise RuntimeError('Write-behind order is closed')
+
+    def __enqueue(self, changes):
+        with self.__condition:
+            for order_id, change in changes:
+                self.writes += 1
+                if order_id in self.pending:
+                    self.collapsed += 1
+                elif len(self.pending) >= self.max_pending:
+                    # backpressure, new orders wait until a flush makes room
+                    self.__condition.notify_all()
+                    self.__condition.wait_for(lambda: len(self.pending) < self.max_pending or self.__closed)
+                self.pending[order_id] = change
+            if self.__full():
+                self.__condition.notify_all()
+
+    def __full(self):
+        return len(self.pending) >= min(self.batch_size, self.max_pending)
+
+    def __send_batch(self):
+        with self.__condition:
+            batch = [(order_id, self.pending.pop(order_id))
+                     for order_id in list(islice(self.pending, self.batch_size))]
+            self.__condition.notify_all()
+        if not batch:
+            return False
+        operations = [dict(OrderCodec.to_dict(order), op=PUT) if op == PUT else {'op': DELETE, 'order_id': order_id}
+                      for order_id, (op, order) in batch]
+        try:
+            response = self.session.post(self.fake_api + '/batch', json={'operations': operations},
+                                         timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            with self.__condition:
+                # changes written meanwhile are newer than the failed ones
+                for order_id, change in reversed(batch):
+                    if order_id not in self.pending:
+                        self.pending[order_id] = change
+                        self.pending.move_to_end(order_id, last=False)
+            raise
+        self.batches += 1
+        self.sent += len(batch)
+        return True
+
+    def __run(self):
+        failed = False
+        while True:
+            with self.__condition:
+                if failed:
+                    self.__condition.wait(self.flush_interval)
+                else:
+                    self.__condition.wait_for(lambda: self.__full() or self.__closed, self.flush_interval)
+                if self.__closed:
+                    return
+            try:
+                self.flush()
+                failed = False
+            except Exception as error:
+                # kept for callers, the thread retries on the next interval
+                self.last_error = error
+                failed = True
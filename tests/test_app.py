@@ -0,0 +1,103 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import *
+from assertpy import *
+import app
+from order import OrderCodec
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderRepository
+
+
+class AppTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.join(self.directory, 'orders.ndjson')
+        self.orders = [OrderModel(order_id, order_id % 3, [{'name': 'name1', 'value': order_id}])
+                       for order_id in range(1, 26)]
+        with open(self.input, 'w') as output:
+            OrderCodec.write_ndjson(self.orders, output)
+
+    def read(self, path):
+        with open(path) as lines:
+            return [(order.order_id, order.client, order.items) for order in OrderCodec.read_ndjson(lines)]
+
+    def test_import_orders(self):
+        repository = OrderRepository()
+        with open(self.input) as lines:
+            result = app.import_orders(repository, lines, batch_size=4, queue_size=1)
+        assert_that(result).is_equal_to((25, 0))
+        assert_that(repository.find_by_id(7).items).is_equal_to([{'name': 'name1', 'value': 7}])
+
+    def test_import_orders_batches(self):
+        repository = Mock(OrderRepository)
+        repository.add_many.side_effect = lambda orders: [True] * len(orders)
+        with open(self.input) as lines:
+            app.import_orders(repository, lines, batch_size=10)
+        assert_that([len(call.args[0]) for call in repository.add_many.call_args_list]).is_equal_to([10, 10, 5])
+
+    def test_import_orders_skips_duplicates(self):
+        repository = OrderRepository([OrderModel(1, 1, [])])
+        with open(self.input) as lines:
+            assert_that(app.import_orders(repository, lines)).is_equal_to((24, 1))
+
+    def test_import_orders_invalid_line(self):
+        lines = io.StringIO('{"order": {"items": [], "order_id": 1, "client_id": 1}}\nnot json\n')
+        assert_that(app.import_orders).raises(ValueError).when_called_with(OrderRepository(), lines, 1)
+
+    def test_import_orders_stops_producer_on_failure(self):
+        repository = Mock(OrderRepository)
+        repository.add_many.side_effect = ValueError('disk full')
+        threads = threading.active_count()
+        with open(self.input) as lines:
+            assert_that(app.import_orders).raises(ValueError).when_called_with(repository, lines, 1, 1)
+        assert_that(threading.active_count()).is_equal_to(threads)
+
+    def test_export_orders(self):
+        output = io.StringIO()
+        progress = app.Progress('exported')
+        assert_that(app.export_orders(OrderRepository(self.orders), output, 10, progress)).is_equal_to(25)
+        assert_that(progress.count).is_equal_to(25)
+        assert_that(output.getvalue().splitlines()).is_length(25)
+
+    def test_export_orders_streams(self):
+        repository = Mock(OrderRepository)
+        repository.iter_orders.return_value = iter(self.orders)
+        app.export_orders(repository, io.StringIO())
+        repository.iter_orders.assert_called_once_with()
+
+    def test_progress_output(self):
+        output = io.StringIO()
+        clock = Mock(side_effect=[0, 2, 2, 2, 4])
+        progress = app.Progress('imported', output, interval=1, clock=clock)
+        progress.advance(10)
+        progress.finish()
+        assert_that(output.getvalue()).is_equal_to('\rimported 10 orders, 5 orders/s\rimported 10 orders, 2 orders/s\n')
+
+    def test_main_round_trip_sqlite(self):
+        database = os.path.join(self.directory, 'orders.db')
+        output = os.path.join(self.directory, 'copy.ndjson')
+        app.main(['--backend', 'sqlite', '--path', database, '--quiet', 'import', self.input])
+        app.main(['--backend', 'sqlite', '--path', database, '--quiet', 'export', output])
+        assert_that(self.read(output)).is_equal_to(self.read(self.input))
+
+    def test_main_round_trip_file(self):
+        log = os.path.join(self.directory, 'orders.log')
+        output = os.path.join(self.directory, 'copy.ndjson')
+        app.main(['--backend', 'file', '--path', log, '--quiet', 'import', self.input])
+        app.main(['--backend', 'file', '--path', log, '--quiet', 'export', output])
+        assert_that(self.read(output)).is_equal_to(self.read(self.input))
+
+    def test_main_backend_without_path(self):
+        with patch('sys.stderr', new_callable=io.StringIO):
+            assert_that(app.main).raises(SystemExit).when_called_with(['--backend', 'file', 'export', '-'])
+
+    def test_open_repository_unknown_backend(self):
+        assert_that(app.open_repository).raises(ValueError).when_called_with('redis', 'orders')
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import unittest
+from assertpy import *
+from client.async_client import AsyncClient
+
+
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.session = FakeSession()
+        self.temp = AsyncClient(max_concurrency=2, session=self.session)
+
+    async def test_add_client(self):
+        self.session.respond(201, {'id': 1})
+        response = await self.temp.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(response.json['id']).is_equal_to(1)
+        assert_that(self.session.calls).is_equal_to([('POST', 'https://virtual-shop.pl/api/clients/add')])
+
+    async def test_add_client_existing_email(self):
+        self.session.respond(409)
+        response = await self.temp.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(response).is_equal_to('User of given email exists')
+
+    async def test_add_client_other_error(self):
+        self.session.respond(500)
+        response = await self.temp.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(response).is_equal_to('Some horrible error happend')
+
+    async def test_add_client_value_error_missing_field(self):
+        with self.assertRaises(ValueError):
+            await self.temp.add_client({'name': 'Olek', 'surname': 'Wardyn'})
+
+    async def test_get_client(self):
+        self.session.respond(200, {'id': 1, 'email': 'olekwardyn@gmail.com'})
+        response = await self.temp.get_client(1)
+        assert_that(response['email']).is_equal_to('olekwardyn@gmail.com')
+
+    async def test_get_client_not_existing(self):
+        self.session.respond(404)
+        response = await self.temp.get_client(2)
+        assert_that(response).is_equal_to('User does not exist')
+
+    async def test_get_client_error(self):
+        self.session.respond(400)
+        response = await self.temp.get_client(3)
+        assert_that(response).is_equal_to('Something went horribly wrong')
+
+    async def test_get_client_type_error(self):
+        with self.assertRaises(TypeError):
+            await self.temp.get_client('id')
+
+    async def test_get_clients(self):
+        self.session.respond(200, {'results': [{'id': 1}, {'id': 2}]})
+        response = await self.temp.get_clients()
+        assert_that(response.json['results']).is_length(2)
+
+    async def test_update_client_not_existing(self):
+        self.session.respond(404)
+        response = await self.temp.update_client(3, {'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(response.status_code).is_equal_to(404)
+
+    async def test_update_client_other_errors(self):
+        self.session.respond(403)
+        response = await self.temp.update_client(1, {'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(response).is_equal_to('Something went horribly wrong')
+
+    async def test_update_client_type_error(self):
+        with self.assertRaises(TypeError):
+            await self.temp.update_client(2, 'object')
+
+    async def test_delete_client(self):
+        self.session.respond(200, {'deleted_id': 1})
+        response = await self.temp.delete_client(1)
+        assert_that(response.json['deleted_id']).is_equal_to(1)
+        assert_that(self.session.calls[0][0]).is_equal_to('DELETE')
+
+    async def test_get_client_order(self):
+        self.session.respond(200, {'order': {'items': [], 'order_id': 4, 'client_id': 3}})
+        response = await self.temp.get_client_order(3, 4)
+        assert_that(response.status_code).is_equal_to(200)
+        assert_that(self.session.calls[0][1]).ends_with('/3/order/4')
+
+    async def test_get_client_order_type_error(self):
+        with self.assertRaises(TypeError):
+            await self.temp.get_client_order('id', 3)
+
+    async def test_get_client_payment_amount(self):
+        self.session.respond(200, {'orders': [{'order': [{'name': 'name1', 'value': 10}, {'name': 'name2', 'value': 20}]}, {'order': [{'name': 'name3', 'value': 22}, {'name': 'name2', 'value': 33}]}]})
+        response = await self.temp.get_client_payment_amount(1)
+        assert_that(response).is_equal_to(85)
+
+    async def test_get_clients_by_ids_keeps_order_and_errors(self):
+        self.session.respond(200, {'id': 1})
+        self.session.respond_for('/2', 404)
+        self.session.respond_for('/3', error=ConnectionError('Error'))
+        response = await self.temp.get_clients_by_ids([1, 2, 3])
+        assert_that(response[0]).is_equal_to({'id': 1})
+        assert_that(response[1]).is_equal_to('User does not exist')
+        assert_that(response[2]).is_instance_of(ConnectionError)
+
+    async def test_concurrency_is_bounded(self):
+        self.session.respond(200, {'id': 1})
+        await self.temp.get_clients_by_ids(list(range(10)))
+        assert_that(self.session.max_in_flight).is_equal_to(2)
+
+    async def test_context_manager_keeps_injected_session_open(self):
+        async with AsyncClient(session=self.session):
+            pass
+        assert_that(self.session.closed).is_false()
+
+    def tearDown(self) -> None:
+        self.temp = None
+
+
+class FakeSession(object):
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.default = (200, None, None)
+        self.overrides = {}
+
+    def respond(self, status, body=None):
+        self.default = (status, body, None)
+
+    def respond_for(self, suffix, status=200, body=None, error=None):
+        self.overrides[suffix] = (status, body, error)
+
+    def request(self, method, url, json=None):
+        self.calls.append((method, url))
+        for suffix, response in self.overrides.items():
+            if url.endswith(suffix):
+                return FakeRequest(self, *response)
+        return FakeRequest(self, *self.default)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeRequest(object):
+    def __init__(self, session, status, body, error):
+        self.session = session
+        self.status = status
+        self.body = body
+        self.error = error
+
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.max_in_flight = max(self.session.max_in_flight, self.session.in_flight)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            self.session.in_flight -= 1
+            raise self.error
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.session.in_flight -= 1
+
+    async def read(self):
+        return b'' if self.body is None else json.dumps(self.body).encode('utf-8')
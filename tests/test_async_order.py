@@ -0,0 +1,135 @@
+import unittest
+from unittest.mock import *
+from assertpy import *
+from order.AsyncOrder import AsyncOrder
+from order.AsyncOrderRepository import AsyncOrderRepository, ExecutorOrderRepository
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderRepository
+from order.SqliteOrderRepository import SqliteOrderRepository
+
+
+class AsyncOrderTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.model = OrderModel(1, 1, [{'name': 'name1', 'value': 2}])
+
+    async def test_get_order_return_none(self):
+        stub_repo = AsyncMock(AsyncOrderRepository)
+        stub_repo.find_by_id.return_value = None
+        response = await AsyncOrder(stub_repo).get_order(1)
+        self.assertEqual(response, 'Item does not exist')
+
+    async def test_get_order_find_by_id_awaited_once(self):
+        spy_repo = AsyncMock(AsyncOrderRepository)
+        spy_repo.find_by_id.return_value = self.model
+        response = await AsyncOrder(spy_repo).get_order(1)
+        assert_that(response).is_same_as(self.model)
+        spy_repo.find_by_id.assert_awaited_once_with(1)
+
+    async def test_get_order_type_error(self):
+        with self.assertRaises(TypeError):
+            await AsyncOrder().get_order('id')
+
+    async def test_get_order_value_error(self):
+        with self.assertRaises(ValueError):
+            await AsyncOrder().get_order(-1)
+
+    async def test_add_order_add_awaited(self):
+        spy_repo = AsyncMock(AsyncOrderRepository)
+        await AsyncOrder(spy_repo).add_order(self.model)
+        spy_repo.add.assert_awaited_once_with(self.model)
+
+    async def test_add_order_type_error(self):
+        with self.assertRaises(TypeError):
+            await AsyncOrder().add_order('Not order model')
+
+    async def test_update_order_value_error(self):
+        with self.assertRaises(ValueError):
+            await AsyncOrder().update_order(-1, self.model)
+
+    async def test_update_order_to_existing_id(self):
+        repository = MemoryRepository()
+        other = OrderModel(2, 9, [])
+        await repository.add(self.model)
+        await repository.add(other)
+        with self.assertRaises(ValueError):
+            await AsyncOrder(repository).update_order(1, OrderModel(2, 5, []))
+        assert_that(await repository.find_many([1, 2])).is_equal_to([self.model, other])
+
+    async def test_delete_order(self):
+        stub_repo = AsyncMock(AsyncOrderRepository)
+        stub_repo.delete_by_id.return_value = True
+        assert_that(await AsyncOrder(stub_repo).delete_order(1)).is_true()
+
+    async def test_delete_order_type_error(self):
+        with self.assertRaises(TypeError):
+            await AsyncOrder().delete_order('id')
+
+    async def test_get_orders_invalid_id(self):
+        spy_repo = AsyncMock(AsyncOrderRepository)
+        spy_repo.find_many.return_value = [None]
+        assert_that(await AsyncOrder(spy_repo).get_orders([1, 'id'])).is_equal_to(['missing', 'invalid'])
+        spy_repo.find_many.assert_awaited_once_with([1])
+
+    async def test_add_orders_all_invalid(self):
+        spy_repo = AsyncMock(AsyncOrderRepository)
+        assert_that(await AsyncOrder(spy_repo).add_orders([None])).is_equal_to(['invalid'])
+        spy_repo.add_many.assert_not_awaited()
+
+    async def test_executor_repository(self):
+        repository = ExecutorOrderRepository(OrderRepository([self.model]))
+        order = AsyncOrder(repository)
+        assert_that(await order.get_order(1)).is_same_as(self.model)
+        assert_that(await order.add_orders([OrderModel(2, 1, []), OrderModel(2, 1, [])])).is_equal_to(
+            ['inserted', 'duplicate'])
+        assert_that(await order.upsert_orders([OrderModel(3, 2, []), OrderModel(3, 2, [])])).is_equal_to(['inserted', 'updated'])
+        assert_that(await order.update_order(3, OrderModel(3, 1, []))).is_true()
+        assert_that(await repository.count_by_client(1)).is_equal_to(3)
+        assert_that(await order.delete_orders([1, 1])).is_equal_to(['deleted', 'missing'])
+        assert_that(await order.get_orders([1, 2])).is_equal_to(['missing', repository.repository.find_by_id(2)])
+        repository.close()
+
+    async def test_executor_repository_sqlite(self):
+        repository = ExecutorOrderRepository(SqliteOrderRepository(check_same_thread=False))
+        order = AsyncOrder(repository)
+        await order.add_order(self.model)
+        assert_that((await order.get_order(1)).items).is_equal_to([{'name': 'name1', 'value': 2}])
+        assert_that(await order.delete_order(1)).is_true()
+        repository.close()
+
+    async def test_protocol_batch_defaults(self):
+        repository = MemoryRepository()
+        assert_that(await repository.add_many([self.model, OrderModel(1, 2, [])])).is_equal_to([True, False])
+        assert_that(await repository.find_many([1, 2])).is_equal_to([self.model, None])
+        assert_that(await repository.upsert_many([self.model])).is_equal_to([False])
+        assert_that(await repository.delete_many([1, 1])).is_equal_to([True, False])
+
+    def tearDown(self) -> None:
+        self.model = None
+
+
+class MemoryRepository(AsyncOrderRepository):
+    def __init__(self):
+        self.orders = {}
+
+    async def find_by_id(self, order_id):
+        return self.orders.get(order_id)
+
+    async def add(self, order):
+        return self.orders.setdefault(order.order_id, order) is order
+
+    async def delete(self, order):
+        del self.orders[order.order_id]
+
+    async def delete_by_id(self, order_id):
+        return self.orders.pop(order_id, None) is not None
+
+    async def upsert(self, order):
+        inserted = order.order_id not in self.orders
+        self.orders[order.order_id] = order
+        return inserted
+
+    async def update(self, order_id, new_order):
+        if await self.delete_by_id(order_id):
+            return await self.add(new_order) or True
+        return False
@@ -0,0 +1,61 @@
+import unittest
+from assertpy import *
+from client.cache import ResponseCache, MISSING
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = 0
+        self.cache = ResponseCache(max_size=2, ttl=10, clock=lambda: self.now)
+
+    def test_get_missing(self):
+        assert_that(self.cache.get('key')).is_same_as(MISSING)
+        assert_that(self.cache.misses).is_equal_to(1)
+
+    def test_get_default(self):
+        assert_that(self.cache.get('key', None)).is_none()
+
+    def test_set_and_get(self):
+        self.cache.set('key', 'value')
+        assert_that(self.cache.get('key')).is_equal_to('value')
+        assert_that(self.cache.hits).is_equal_to(1)
+
+    def test_entry_expires(self):
+        self.cache.set('key', 'value')
+        self.now = 10
+        assert_that(self.cache.get('key')).is_same_as(MISSING)
+        assert_that(self.cache.stats()).contains_entry({'expirations': 1}, {'size': 0})
+
+    def test_entry_ttl_override(self):
+        self.cache.set('key', 'value', ttl=20)
+        self.now = 15
+        assert_that(self.cache.get('key')).is_equal_to('value')
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        assert_that(self.cache.get('b')).is_same_as(MISSING)
+        assert_that(self.cache.get('a')).is_equal_to(1)
+        assert_that(self.cache.evictions).is_equal_to(1)
+
+    def test_invalidate(self):
+        self.cache.set('a', 1)
+        self.cache.invalidate('a')
+        self.cache.invalidate('b')
+        assert_that(self.cache).is_length(0)
+
+    def test_invalidate_group(self):
+        self.cache.set('a', 1, group=1)
+        self.cache.set('b', 2, group=2)
+        self.cache.invalidate_group(1)
+        assert_that(self.cache.get('a')).is_same_as(MISSING)
+        assert_that(self.cache.get('b')).is_equal_to(2)
+
+    def test_size_value_error(self):
+        assert_that(ResponseCache).raises(ValueError).when_called_with(0)
+
+    def tearDown(self) -> None:
+        self.cache = None
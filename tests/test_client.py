@@ -1,7 +1,9 @@
 import unittest
+import requests
 from assertpy import *
 from unittest.mock import *
 from client.client import Client
+from client.cache import ResponseCache
 
 
 def create_request_mock(to_mock, fake_response):
@@ -14,13 +16,13 @@ class ClientTest(unittest.TestCase):
     def setUp(self) -> None:
         self.temp = Client()
 
-    @patch('src.client.client.requests.post')
+    @patch('src.client.client.requests.Session.post')
     def test_add_client(self, mock_post):
         create_request_mock(mock_post, FakeResponse(201, {'id': 1}))
         response = self.temp.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
         assert_that(response.json['id']).is_greater_than(0)
 
-    @patch('src.client.client.requests.post')
+    @patch('src.client.client.requests.Session.post')
     def test_add_client_mock_post_called(self, mock_post):
         create_request_mock(mock_post, FakeResponse(201, {'id': 1}))
         self.temp.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
@@ -35,14 +37,14 @@ class ClientTest(unittest.TestCase):
         assert_that(self.temp.add_client).raises(
             ValueError).when_called_with({'name': 'Olek', 'surname': 'Wardyn'})
 
-    @patch('src.client.client.requests.post')
+    @patch('src.client.client.requests.Session.post')
     def test_add_client_existing_email(self, mock_post):
         create_request_mock(mock_post, FakeResponse(409))
         response = self.temp.add_client({'name': 'Olek', 'surname':
             'Wardyn', 'email': 'olekwardyn@gmail.com'})
         assert_that(response).is_equal_to('User of given email exists')
 
-    @patch('src.client.client.requests.post')
+    @patch('src.client.client.requests.Session.post')
     def test_add_client_other_errors_mock_called(self, mock_post):
         create_request_mock(mock_post, FakeResponse(404,
                                                     error_message='Mock has been called'))
@@ -70,25 +72,25 @@ class ClientTest(unittest.TestCase):
         self.temp.get_client(1)
         self.temp.get_client.assert_called_with(1)
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_not_existing_client(self, mock_get):
         create_request_mock(mock_get, FakeResponse(404))
         response = self.temp.get_client(2)
         self.assertEqual(response, 'User does not exist')
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_not_existing_client_mock_called(self, mock_get):
         create_request_mock(mock_get, FakeResponse(404))
         self.temp.get_client(2)
         mock_get.assert_called_once()
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_error(self, mock_get):
         create_request_mock(mock_get, FakeResponse(400))
         response = self.temp.get_client(3)
         self.assertEqual(response, 'Something went horribly wrong')
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_error_mock_called(self, mock_get):
         create_request_mock(mock_get, FakeResponse(400))
         self.temp.get_client(3)
@@ -147,7 +149,7 @@ class ClientTest(unittest.TestCase):
         self.temp.get_clients = Mock(side_effect=ConnectionError('Error'))
         assert_that(self.temp.get_clients).raises(ConnectionError)
 
-    @patch('src.client.client.requests.put')
+    @patch('src.client.client.requests.Session.put')
     def test_update_client(self, mock_put):
         client_id = 1
         create_request_mock(mock_put, FakeResponse(200, {'id': client_id}))
@@ -157,7 +159,7 @@ class ClientTest(unittest.TestCase):
                                                        'email': 'olekwardyn@gmail.com'})
         assert_that(response.json['id']).is_equal_to(client_id)
 
-    @patch('src.client.client.requests.put')
+    @patch('src.client.client.requests.Session.put')
     def test_update_client_mock_called(self, mock_put):
         create_request_mock(mock_put, FakeResponse(200, {'id': 1}))
         self.temp.update_client(1, {'name': 'Olek',
@@ -195,7 +197,7 @@ class ClientTest(unittest.TestCase):
             'Wardyn', 'email': 'olekwardyn@gmail.com'})
         self.temp.update_client.assert_called_once()
 
-    @patch('src.client.client.requests.put')
+    @patch('src.client.client.requests.Session.put')
     def test_update_client_user_does_not_exist(self, mock_put):
         create_request_mock(mock_put, FakeResponse(404,
                                                    error_message='User does not exist'))
@@ -203,7 +205,7 @@ class ClientTest(unittest.TestCase):
             'Wardyn', 'email': 'olekwardyn@gmail.com'})
         assert_that(response.error_message).contains('does', 'not')
 
-    @patch('src.client.client.requests.put')
+    @patch('src.client.client.requests.Session.put')
     def test_update_client_user_does_not_exist_mock_called(self, mock_put):
         create_request_mock(mock_put, FakeResponse(404,
                                                    error_message='User does not exist'))
@@ -211,7 +213,7 @@ class ClientTest(unittest.TestCase):
             'Wardyn', 'email': 'olekwardyn@gmail.com'})
         mock_put.assert_called_once()
 
-    @patch('src.client.client.requests.put')
+    @patch('src.client.client.requests.Session.put')
     def test_update_client_other_errors(self, mock_put):
         create_request_mock(mock_put, FakeResponse(403))
         response = self.temp.update_client(1, {'name': 'Olek', 'surname':
@@ -219,7 +221,7 @@ class ClientTest(unittest.TestCase):
         assert_that(response).is_equal_to_ignoring_case('SOMETHING WENT '
                                                         'HORRIBLY WRONG')
 
-    @patch('src.client.client.requests.put')
+    @patch('src.client.client.requests.Session.put')
     def test_update_client_other_errors_mock_called(self, mock_put):
         create_request_mock(mock_put, FakeResponse(403))
         self.temp.update_client(1, {'name': 'Olek', 'surname':
@@ -237,14 +239,14 @@ class ClientTest(unittest.TestCase):
                     'Wardyn',
                 'email': 'olekwardyn@gmail.com'})
 
-    @patch('src.client.client.requests.delete')
+    @patch('src.client.client.requests.Session.delete')
     def test_delete_client_existing(self, mock_delete):
         client_id = 1
         create_request_mock(mock_delete, FakeResponse(200, {'deleted_id': client_id}))
         response = self.temp.delete_client(client_id)
         assert_that(response.json['deleted_id']).is_close_to(client_id, 0)
 
-    @patch('src.client.client.requests.delete')
+    @patch('src.client.client.requests.Session.delete')
     def test_delete_client_existing_mock_called(self, mock_delete):
         create_request_mock(mock_delete, FakeResponse(200, {'deleted_id': 1}))
         self.temp.delete_client(1)
@@ -290,14 +292,14 @@ class ClientTest(unittest.TestCase):
         self.temp.get_client_order(1, 1)
         self.temp.get_client_order.assert_called_with(1, 1)
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_order_not_existing_client(self, mock_get):
         create_request_mock(mock_get, FakeResponse(404,
                                                    error_message='User does not exist'))
         response = self.temp.get_client_order(3, 4)
         self.assertEqual(response.error_message, 'User does not exist')
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_order_not_existing_client_mock_called(self, mock_get):
         create_request_mock(mock_get, FakeResponse(404,
                                                    error_message='User does not exist'))
@@ -337,14 +339,14 @@ class ClientTest(unittest.TestCase):
         self.temp.get_client_orders(1)
         self.temp.get_client_orders.assert_called_with(1)
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_orders_not_existing_client(self, mock_get):
         create_request_mock(mock_get, FakeResponse(404, error_message='User '
                                                                       'does not exist'))
         response = self.temp.get_client_orders(3)
         self.assertEqual(response.error_message, 'User does not exist')
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_orders_not_existing_client_mock_called(self, mock_get):
         create_request_mock(mock_get, FakeResponse(404, error_message='User '
                                                                       'does not exist'))
@@ -355,19 +357,197 @@ class ClientTest(unittest.TestCase):
         assert_that(self.temp.get_client_orders).raises(
             TypeError).when_called_with("id")
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_payment(self, mock_get):
         create_request_mock(mock_get, FakeResponse(200, {'orders': [{'order': [{'name': 'name1', 'value': 10}, {'name': 'name2', 'value': 20}]}, {'order': [{'name': 'name3', 'value': 22}, {'name': 'name2', 'value': 33}]}]}))
         response = self.temp.get_client_payment_amount(1)
         assert_that(response).is_equal_to(85)
 
-    @patch('src.client.client.requests.get')
+    @patch('src.client.client.requests.Session.get')
     def test_get_client_payment_mock_called(self, mock_get):
         create_request_mock(mock_get, FakeResponse(200, {'orders': [{'order': [{'name': 'name1', 'value': 10}, {'name': 'name2', 'value': 20}]}, {'order': [{'name': 'name3', 'value': 22}, {'name': 'name2', 'value': 33}]}]}))
         self.temp.get_client_payment_amount(1)
         mock_get.assert_called_once()
 
+    def test_session_pool_configuration(self):
+        client = Client(pool_size=4, retries=2)
+        adapter = client.session.get_adapter('https://virtual-shop.pl')
+        assert_that(adapter._pool_maxsize).is_equal_to(4)
+        assert_that(adapter.max_retries.total).is_equal_to(2)
+        client.close()
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_uses_timeout(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(404))
+        client = Client(timeout=3)
+        client.get_client(1)
+        mock_get.assert_called_once_with('https://virtual-shop.pl/api/clients/1', timeout=3)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_burst_reuses_session(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'id': 1}))
+        session = self.temp.session
+        for client_id in range(5):
+            self.temp.get_client(client_id)
+        assert_that(mock_get.call_count).is_equal_to(5)
+        assert_that(self.temp.session).is_same_as(session)
+
+    @patch('src.client.client.requests.Session.close')
+    def test_context_manager_closes_session(self, mock_close):
+        with Client() as client:
+            assert_that(client).is_instance_of(Client)
+        mock_close.assert_called_once()
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_clients_by_ids(self, mock_get):
+        mock_get.side_effect = lambda url, timeout: FakeResponse(404) if url.endswith('/2') \
+            else FakeResponse(200, {'id': int(url.rsplit('/', 1)[1])})
+        response = self.temp.get_clients_by_ids([3, 2, 1], max_workers=2)
+        assert_that(response).is_equal_to([{'id': 3}, 'User does not exist', {'id': 1}])
+        assert_that(mock_get.call_count).is_equal_to(3)
+
+    def test_get_clients_by_ids_collects_errors(self):
+        error = ConnectionError('Error')
+        self.temp.get_client = Mock(side_effect=[{'id': 1}, error, {'id': 3}])
+        response = self.temp.get_clients_by_ids([1, 2, 3], max_workers=1)
+        assert_that(response).is_equal_to([{'id': 1}, error, {'id': 3}])
+
+    def test_get_clients_by_ids_type_error(self):
+        self.temp.get_client = Mock()
+        assert_that(self.temp.get_clients_by_ids).raises(TypeError).when_called_with([1, 'id'])
+        self.temp.get_client.assert_not_called()
+
+    def test_get_client_orders_many(self):
+        self.temp.get_client_orders = Mock(side_effect=lambda client_id: FakeResponse(200, {'orders': [client_id]}))
+        response = self.temp.get_client_orders_many(range(4))
+        assert_that([r.json['orders'][0] for r in response]).is_equal_to([0, 1, 2, 3])
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_cached(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'id': 1}))
+        client = Client(cache=ResponseCache())
+        client.get_client(1)
+        response = client.get_client(1)
+        assert_that(response).is_equal_to({'id': 1})
+        mock_get.assert_called_once()
+        assert_that(client.cache.stats()).contains_entry({'hits': 1}, {'misses': 1})
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_errors_not_cached(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(404))
+        client = Client(cache=ResponseCache())
+        client.get_client(1)
+        client.get_client(1)
+        assert_that(mock_get.call_count).is_equal_to(2)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_orders_cached(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'orders': []}))
+        client = Client(cache=ResponseCache())
+        client.get_client_orders(1)
+        client.get_client_order(1, 2)
+        client.get_client_orders(1)
+        client.get_client_order(1, 2)
+        assert_that(mock_get.call_count).is_equal_to(2)
+
+    @patch('src.client.client.requests.Session.put')
+    @patch('src.client.client.requests.Session.get')
+    def test_update_client_invalidates_cache(self, mock_get, mock_put):
+        create_request_mock(mock_get, FakeResponse(200, {'id': 1}))
+        create_request_mock(mock_put, FakeResponse(200, {'id': 1}))
+        client = Client(cache=ResponseCache())
+        client.get_client(1)
+        client.get_client_orders(1)
+        client.update_client(1, {'name': 'Olek', 'surname': 'Wardyn2', 'email': 'olekwardyn@gmail.com'})
+        client.get_client(1)
+        client.get_client_orders(1)
+        assert_that(mock_get.call_count).is_equal_to(4)
+
+    @patch('src.client.client.requests.Session.delete')
+    @patch('src.client.client.requests.Session.get')
+    def test_delete_client_invalidates_cache(self, mock_get, mock_delete):
+        create_request_mock(mock_get, FakeResponse(200, {'id': 1}))
+        create_request_mock(mock_delete, FakeResponse(200, {'deleted_id': 1}))
+        client = Client(cache=ResponseCache())
+        client.get_client(1)
+        client.get_client(2)
+        client.delete_client(1)
+        assert_that(client.cache).is_length(1)
+
+    @patch('src.client.client.requests.Session.post')
+    def test_add_client_invalidates_cache(self, mock_post):
+        create_request_mock(mock_post, FakeResponse(201, {'id': 5}))
+        client = Client(cache=ResponseCache())
+        client.cache.set(('get_client', 5), 'stale', group=5)
+        client.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(client.cache).is_length(0)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_iter_clients_pages(self, mock_get):
+        mock_get.side_effect = [FakeResponse(200, {'results': [{'id': 1}, {'id': 2}]}),
+                                FakeResponse(200, {'results': [{'id': 3}]})]
+        response = list(self.temp.iter_clients(page_size=2))
+        assert_that([client['id'] for client in response]).is_equal_to([1, 2, 3])
+        mock_get.assert_called_with('https://virtual-shop.pl/api/clients', params={'page': 2, 'page_size': 2},
+                                    timeout=10)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_iter_clients_stops_on_empty_page(self, mock_get):
+        mock_get.side_effect = [FakeResponse(200, {'results': [{'id': 1}]}),
+                                FakeResponse(200, {'results': []})]
+        response = list(self.temp.iter_clients(page_size=1))
+        assert_that(response).is_length(1)
+        assert_that(mock_get.call_count).is_equal_to(2)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_iter_clients_stop_early(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'results': [{'id': 1}, {'id': 2}]}))
+        clients = self.temp.iter_clients(page_size=2)
+        next(clients)
+        next(clients)
+        clients.close()
+        mock_get.assert_called_once()
+
+    @patch('src.client.client.requests.Session.get')
+    def test_iter_clients_error(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(500))
+        assert_that(list).raises(requests.HTTPError).when_called_with(self.temp.iter_clients())
+
+    def test_iter_clients_page_size_value_error(self):
+        assert_that(list).raises(ValueError).when_called_with(self.temp.iter_clients(page_size=0))
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_payment_float_values(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'orders': [{'order': [{'value': 0.1}] * 10}, {'order': []}]}))
+        response = self.temp.get_client_payment_amount(1)
+        assert_that(response).is_equal_to(1.0)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_payment_int_values(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'orders': [{'order': [{'value': 2 ** 60}, {'value': 1}]}]}))
+        response = self.temp.get_client_payment_amount(1)
+        assert_that(response).is_instance_of(int).is_equal_to(2 ** 60 + 1)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_payment_mixed_values(self, mock_get):
+        create_request_mock(mock_get, FakeResponse(200, {'orders': [{'order': [{'value': 10}, {'value': 0.5}]}]}))
+        assert_that(self.temp.get_client_payment_amount(1)).is_instance_of(float).is_equal_to(10.5)
+
+    def test_get_clients_payment_amounts(self):
+        error = ConnectionError('Error')
+        self.temp.get_client_orders = Mock(side_effect=[
+            FakeResponse(200, {'orders': [{'order': [{'name': 'name1', 'value': 10}]}]}),
+            FakeResponse(404, error_message='User does not exist'),
+            error,
+            FakeResponse(200, {'orders': []})])
+        response = self.temp.get_clients_payment_amounts([1, 2, 3, 4], max_workers=1)
+        assert_that(response[0]).is_equal_to(10)
+        assert_that(response[1].error_message).is_equal_to('User does not exist')
+        assert_that(response[2]).is_same_as(error)
+        assert_that(response[3]).is_equal_to(0)
+
     def tearDown(self) -> None:
+        self.temp.close()
         self.temp = None
 
 
@@ -0,0 +1,102 @@
+import sys
+import threading
+import unittest
+from assertpy import *
+from order.ConcurrentOrderRepository import ConcurrentOrderRepository
+from order.Order import Order
+from order.OrderModel import OrderModel
+
+
+def run_threads(target, count):
+    errors = []
+
+    def run(number):
+        try:
+            target(number)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(number,)) for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class ConcurrentOrderRepositoryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.repository = ConcurrentOrderRepository([OrderModel(1, 1, [])], stripes=8)
+        # switch threads as often as possible to provoke races
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def test_repository_operations(self):
+        assert_that(self.repository.add(OrderModel(2, 1, []))).is_true()
+        assert_that(self.repository.add(OrderModel(2, 1, []))).is_false()
+        assert_that(self.repository.update(2, OrderModel(3, 2, []))).is_true()
+        assert_that(self.repository.upsert(OrderModel(3, 3, []))).is_false()
+        assert_that(self.repository.delete_by_id(1)).is_true()
+        assert_that(self.repository.find_by_client(3)[0].order_id).is_equal_to(3)
+
+    def test_update_order_to_existing_id(self):
+        self.repository.add(OrderModel(2, 1, []))
+        order = Order(self.repository)
+        assert_that(order.update_order).raises(ValueError).when_called_with(1, OrderModel(2, 5, []))
+        assert_that(self.repository.find_by_id(1)).is_not_none()
+        assert_that(self.repository.find_by_id(2).client).is_equal_to(1)
+
+    def test_stripes_value_error(self):
+        assert_that(ConcurrentOrderRepository).raises(ValueError).when_called_with(None, 0)
+
+    def test_concurrent_add_inserts_each_id_once(self):
+        results = []
+
+        def add(number):
+            results.extend(self.repository.add(OrderModel(order_id, number, [])) for order_id in range(2, 1002))
+
+        assert_that(run_threads(add, 8)).is_empty()
+        assert_that(results.count(True)).is_equal_to(1000)
+        assert_that(self.repository.data_source).is_length(1001)
+
+    def test_concurrent_writes_keep_client_index_consistent(self):
+        def write(number):
+            for order_id in range(1000):
+                self.repository.upsert(OrderModel(order_id, number % 3, []))
+                self.repository.update(order_id, OrderModel(order_id, (number + 1) % 3, []))
+                self.repository.find_by_client(number % 3)
+                if order_id % 2:
+                    self.repository.delete_by_id(order_id)
+
+        assert_that(run_threads(write, 8)).is_empty()
+        orders = self.repository.data_source
+        indexed = [order for client in range(3) for order in self.repository.find_by_client(client)]
+        assert_that(sorted(order.order_id for order in indexed)).is_equal_to(sorted(order.order_id for order in orders))
+        for order in indexed:
+            assert_that(self.repository.find_by_id(order.order_id)).is_same_as(order)
+
+    def test_readers_never_miss_updated_orders(self):
+        repository = ConcurrentOrderRepository([OrderModel(order_id, 0, []) for order_id in range(100)], stripes=8)
+        updaters = threading.Semaphore(0)
+        missing = []
+
+        def work(number):
+            if number < 2:
+                for round_number in range(50):
+                    for order_id in range(100):
+                        repository.update(order_id, OrderModel(order_id, (number + round_number) % 3, []))
+                updaters.release()
+                return
+            finished = 0
+            while finished < 2:
+                missing.extend(order_id for order_id in range(100) if repository.find_by_id(order_id) is None)
+                finished += updaters.acquire(blocking=False)
+
+        assert_that(run_threads(work, 3)).is_empty()
+        assert_that(missing).is_empty()
+        assert_that(sum(repository.count_by_client(client) for client in range(3))).is_equal_to(100)
+
+    def tearDown(self) -> None:
+        sys.setswitchinterval(self.switch_interval)
+        self.repository = None
@@ -0,0 +1,114 @@
+import asyncio
+import time
+import unittest
+import requests
+from assertpy import *
+from client.client import Client
+from client.async_client import AsyncClient, aiohttp
+from fake_api.server import FakeShopServer
+
+BODY = {'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'}
+
+
+class FakeShopServerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = FakeShopServer(seed=1).start()
+        self.server.populate(clients=3, orders_per_client=2, items_per_order=2)
+        self.client = Client()
+        self.client.fake_api = self.server.url
+
+    def test_add_client(self):
+        response = self.client.add_client(BODY)
+        assert_that(response.status_code).is_equal_to(201)
+        assert_that(self.client.get_client(response.json()['id'])['email']).is_equal_to(BODY['email'])
+
+    def test_add_client_existing_email(self):
+        self.client.add_client(BODY)
+        assert_that(self.client.add_client(BODY)).is_equal_to('User of given email exists')
+
+    def test_get_client_not_existing(self):
+        assert_that(self.client.get_client(99)).is_equal_to('User does not exist')
+
+    def test_get_clients(self):
+        assert_that(self.client.get_clients().json()['results']).is_length(3)
+
+    def test_iter_clients(self):
+        assert_that([client['id'] for client in self.client.iter_clients(page_size=2)]).is_equal_to([1, 2, 3])
+
+    def test_get_clients_bad_page(self):
+        for query in ('page_size=abc', 'page_size=0', 'page_size=2&page=0', 'page_size=2&page=-1', 'page_size=2&page=x'):
+            response = self.client.session.get(self.server.url + '?' + query)
+            assert_that(response.status_code).is_equal_to(400)
+        assert_that(self.client.session.get(self.server.url + '?page_size=2&page=2').json()['results']).is_length(1)
+
+    def test_update_client(self):
+        assert_that(self.client.update_client(1, BODY).status_code).is_equal_to(200)
+        assert_that(self.client.update_client(2, BODY).status_code).is_equal_to(409)
+        assert_that(self.client.update_client(99, BODY).status_code).is_equal_to(404)
+
+    def test_delete_client(self):
+        assert_that(self.client.delete_client(1).json()).is_equal_to({'deleted_id': 1})
+        assert_that(self.client.delete_client(1).status_code).is_equal_to(404)
+
+    def test_get_client_order(self):
+        response = self.client.get_client_order(1, 2)
+        assert_that(response.json()['order']['items']).is_length(2)
+        assert_that(self.client.get_client_order(1, 3).status_code).is_equal_to(404)
+
+    def test_get_client_payment_amount(self):
+        expected = sum(item['value'] for order in self.server.orders[2] for item in order['items'])
+        assert_that(self.client.get_client_payment_amount(2)).is_equal_to(expected)
+        assert_that(self.client.get_clients_payment_amounts([1, 2, 3])[1]).is_equal_to(expected)
+
+    def test_orders_endpoints(self):
+        url = self.server.orders_url
+        order = {'order': {'items': [], 'order_id': 50, 'client_id': 1}}
+        assert_that(self.client.session.put(url + '/50', json=order).status_code).is_equal_to(200)
+        assert_that(self.client.session.get(url + '/50').json()).is_equal_to(order)
+        assert_that(self.client.get_client_orders(1).json()['orders']).is_length(3)
+        assert_that(self.client.session.put(url + '/51', json=order).status_code).is_equal_to(400)
+        assert_that(self.client.session.delete(url + '/50').json()).is_equal_to({'deleted_id': 50})
+        assert_that(self.client.session.get(url + '/50').status_code).is_equal_to(404)
+
+    def test_orders_batch(self):
+        operations = [{'op': 'put', 'order': {'items': [], 'order_id': 50, 'client_id': 2}},
+                      {'op': 'delete', 'order_id': 1}]
+        response = self.client.session.post(self.server.orders_url + '/batch', json={'operations': operations})
+        assert_that(response.json()).is_equal_to({'applied': 2})
+        assert_that(self.server.order_index).contains_key(50).does_not_contain_key(1)
+        response = self.client.session.post(self.server.orders_url + '/batch',
+                                            json={'operations': [{'op': 'delete', 'order_id': 2}, {'op': 'move'}]})
+        assert_that(response.status_code).is_equal_to(400)
+        assert_that(self.server.order_index).contains_key(2)
+
+    def test_error_rate(self):
+        self.server.error_rate = 1
+        assert_that(self.client.get_client(1)).is_equal_to('Something went horribly wrong')
+
+    def test_read_timeout(self):
+        self.server.latency = 0.5
+        client = Client(timeout=0.1)
+        client.fake_api = self.server.url
+        assert_that(client.get_client).raises(requests.ReadTimeout).when_called_with(1)
+        client.close()
+
+    def test_latency(self):
+        self.server.latency = 0.05
+        started = time.monotonic()
+        self.client.get_client(1)
+        assert_that(time.monotonic() - started).is_greater_than_or_equal_to(0.05)
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_client(self):
+        async def fetch():
+            async with AsyncClient() as client:
+                client.fake_api = self.server.url
+                return await client.get_clients_by_ids([1, 2, 99])
+
+        response = asyncio.run(fetch())
+        assert_that([response[0]['id'], response[1]['id'], response[2]]).is_equal_to([1, 2, 'User does not exist'])
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.server.stop()
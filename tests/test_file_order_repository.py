@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import *
+from assertpy import *
+from order.FileOrderRepository import FileOrderRepository
+from order.Order import Order
+from order.OrderModel import OrderModel
+
+
+class FileOrderRepositoryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'orders.log')
+        self.repository = FileOrderRepository(self.path)
+        self.repository.add(OrderModel(1, 1, [{'name': 'name1', 'value': 2}]))
+        self.repository.add(OrderModel(2, 1, [{'name': 'name2', 'value': 5}]))
+
+    def reopen(self):
+        self.repository.close()
+        self.repository = FileOrderRepository(self.path)
+
+    def test_find_by_id(self):
+        order = self.repository.find_by_id(2)
+        assert_that(order).is_instance_of(OrderModel)
+        assert_that([order.order_id, order.client, order.items]).is_equal_to([2, 1, [{'name': 'name2', 'value': 5}]])
+
+    def test_find_by_id_not_existing(self):
+        assert_that(self.repository.find_by_id(3)).is_none()
+
+    def test_add_duplicate_id(self):
+        assert_that(self.repository.add(OrderModel(1, 2, []))).is_false()
+
+    def test_delete(self):
+        self.repository.delete(OrderModel(1))
+        assert_that(self.repository.find_by_id(1)).is_none()
+
+    def test_delete_not_existing(self):
+        assert_that(self.repository.delete).raises(ValueError).when_called_with(OrderModel(5, 1, []))
+
+    def test_delete_by_id(self):
+        assert_that(self.repository.delete_by_id(2)).is_true()
+        assert_that(self.repository.delete_by_id(2)).is_false()
+
+    def test_update(self):
+        assert_that(self.repository.update(1, OrderModel(1, 3, []))).is_true()
+        assert_that(self.repository.find_by_id(1).client).is_equal_to(3)
+
+    def test_update_not_existing(self):
+        assert_that(self.repository.update(7, OrderModel(7, 1, []))).is_false()
+
+    def test_update_order_to_existing_id(self):
+        order = Order(self.repository)
+        assert_that(order.update_order).raises(ValueError).when_called_with(1, OrderModel(2, 5, []))
+        assert_that(self.repository.find_by_id(1)).is_not_none()
+        assert_that(self.repository.find_by_id(2).client).is_equal_to(1)
+
+    def test_upsert(self):
+        assert_that(self.repository.upsert(OrderModel(1, 4, []))).is_false()
+        assert_that(self.repository.upsert(OrderModel(3, 4, []))).is_true()
+        assert_that(self.repository.find_by_id(1).client).is_equal_to(4)
+
+    def test_bulk_operations(self):
+        assert_that(self.repository.add_many([OrderModel(3, 1, []), OrderModel(1, 1, []), OrderModel(3, 2, [])])) \
+            .is_equal_to([True, False, False])
+        assert_that(self.repository.find_by_id(3).client).is_equal_to(1)
+        assert_that(self.repository.upsert_many([OrderModel(4, 1, []), OrderModel(4, 2, [])])).is_equal_to([True, False])
+        assert_that(self.repository.delete_many([4, 4, 9])).is_equal_to([True, False, False])
+        assert_that([order.order_id for order in self.repository.data_source]).is_equal_to([1, 2, 3])
+
+    def test_reopen_from_saved_index(self):
+        self.repository.delete_by_id(1)
+        self.reopen()
+        assert_that(self.repository.find_by_id(1)).is_none()
+        assert_that(self.repository.find_by_id(2).items).is_equal_to([{'name': 'name2', 'value': 5}])
+
+    def test_reopen_replays_records_after_index(self):
+        self.repository.close()
+        repository = FileOrderRepository(self.path)
+        repository.add(OrderModel(3, 2, []))
+        repository.delete_by_id(1)
+        # simulates a crash, the index is not saved again
+        repository._FileOrderRepository__close_files()
+        self.repository = FileOrderRepository(self.path)
+        assert_that([order.order_id for order in self.repository.data_source]).is_equal_to([2, 3])
+
+    def test_reopen_without_index(self):
+        self.repository.close()
+        os.remove(self.path + '.idx')
+        self.repository = FileOrderRepository(self.path)
+        assert_that(self.repository.find_by_id(2).order_id).is_equal_to(2)
+
+    def test_reopen_drops_torn_record(self):
+        self.repository.close()
+        with open(self.path, 'ab') as log:
+            log.write(b'\x01\x03\x00')
+        self.repository = FileOrderRepository(self.path)
+        self.repository.add(OrderModel(3, 1, []))
+        self.reopen()
+        assert_that([order.order_id for order in self.repository.data_source]).is_equal_to([1, 2, 3])
+
+    def test_compact(self):
+        for client in range(10):
+            self.repository.upsert(OrderModel(1, client, []))
+        size = os.path.getsize(self.path)
+        self.repository.compact()
+        assert_that(os.path.getsize(self.path)).is_less_than(size)
+        assert_that(self.repository.find_by_id(1).client).is_equal_to(9)
+        self.repository.add(OrderModel(3, 1, []))
+        self.reopen()
+        assert_that([order.order_id for order in self.repository.data_source]).is_equal_to([1, 2, 3])
+
+    def test_client_index(self):
+        self.repository.add(OrderModel(3, 2, []))
+        assert_that([order.order_id for order in self.repository.find_by_client(1)]).is_equal_to([1, 2])
+        self.repository.update(1, OrderModel(1, 2, []))
+        self.repository.upsert_many([OrderModel(4, 1, []), OrderModel(4, 2, [])])
+        self.repository.delete_by_id(3)
+        assert_that(self.repository.count_by_client(1)).is_equal_to(1)
+        assert_that([order.order_id for order in self.repository.find_by_client(2)]).is_equal_to([1, 4])
+        self.reopen()
+        assert_that(self.repository.count_by_client(2)).is_equal_to(2)
+
+    def test_client_index_rebuilt_from_headers(self):
+        self.repository.add(OrderModel(3, 2, []))
+        self.repository.close()
+        for remove_index in (False, True):
+            if remove_index:
+                os.remove(self.path + '.idx')
+            with patch('order.FileOrderRepository.json.loads') as loads:
+                self.repository = FileOrderRepository(self.path)
+                assert_that(self.repository.count_by_client(1)).is_equal_to(2)
+                assert_that(self.repository.count_by_client(2)).is_equal_to(1)
+                loads.assert_not_called()
+            self.repository.close()
+
+    def test_client_index_non_integer_client(self):
+        self.repository.add(OrderModel(3, 'client', []))
+        self.repository.upsert(OrderModel(4, None, []))
+        self.reopen()
+        assert_that([order.order_id for order in self.repository.find_by_client('client')]).is_equal_to([3])
+        self.repository.close()
+        os.remove(self.path + '.idx')
+        self.repository = FileOrderRepository(self.path)
+        assert_that(self.repository.count_by_client(None)).is_equal_to(1)
+        assert_that(self.repository.count_by_client('client')).is_equal_to(1)
+
+    def test_reopen_ignores_index_of_other_format(self):
+        self.repository.close()
+        with open(self.path + '.idx', 'wb') as index:
+            index.write(b'\x00' * 40)
+        self.repository = FileOrderRepository(self.path)
+        assert_that(self.repository.count_by_client(1)).is_equal_to(2)
+
+    def test_failed_batch_leaves_store_unchanged(self):
+        size = os.path.getsize(self.path)
+        for bad in (OrderModel(2 ** 70, 1, []), OrderModel('x', 1, []), OrderModel(None, 1, []),
+                    OrderModel(4, {'id': 7}, [])):
+            assert_that(self.repository.add_many).raises(TypeError).when_called_with([OrderModel(3, 1, []), bad])
+        assert_that(os.path.getsize(self.path)).is_equal_to(size)
+        assert_that(self.repository.find_by_id(3)).is_none()
+        assert_that(self.repository.count_by_client(1)).is_equal_to(2)
+        self.repository.add(OrderModel(3, 2, []))
+        self.reopen()
+        assert_that([(order.order_id, order.client) for order in self.repository.data_source]).is_equal_to(
+            [(1, 1), (2, 1), (3, 2)])
+
+    def test_iter_orders(self):
+        orders = self.repository.iter_orders()
+        assert_that(next(orders).items).is_equal_to([{'name': 'name1', 'value': 2}])
+        assert_that([order.order_id for order in orders]).is_equal_to([2])
+
+    def tearDown(self) -> None:
+        self.repository.close()
+        shutil.rmtree(self.directory)
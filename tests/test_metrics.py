@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import *
+from assertpy import *
+from client.client import Client
+from client.metrics import ClientMetrics
+from fake_api.server import FakeShopServer
+
+
+class ClientMetricsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.metrics = ClientMetrics(buckets=(0.1, 1))
+
+    def test_observe(self):
+        self.metrics.observe('get_client', 0.05, 200, bytes_received=10)
+        self.metrics.observe('get_client', 0.5, 404, bytes_received=5)
+        assert_that(self.metrics.request_count('get_client')).is_equal_to(2)
+        assert_that(self.metrics.status_count('get_client', 404)).is_equal_to(1)
+        assert_that(self.metrics.bytes_count('get_client', 'received')).is_equal_to(15)
+
+    def test_record_retry(self):
+        self.metrics.record_retry('get_client', 2)
+        self.metrics.observe('get_client', 0.05, 200, retries=1)
+        assert_that(self.metrics.retry_count('get_client')).is_equal_to(3)
+
+    def test_listener(self):
+        listener = Mock()
+        self.metrics.add_listener(listener)
+        self.metrics.observe('get_client', 0.05, 200)
+        listener.assert_called_once_with('get_client', 0.05, 200)
+
+    def test_to_prometheus(self):
+        self.metrics.observe('get_client', 0.05, 200, bytes_sent=3)
+        self.metrics.observe('get_client', 0.1, 200)
+        self.metrics.observe('get_client', 2, 'error')
+        text = self.metrics.to_prometheus()
+        assert_that(text).contains('shop_client_request_duration_seconds_bucket{method="get_client",le="0.1"} 2')
+        assert_that(text).contains('shop_client_request_duration_seconds_bucket{method="get_client",le="+Inf"} 3')
+        assert_that(text).contains('shop_client_request_duration_seconds_count{method="get_client"} 3')
+        assert_that(text).contains('shop_client_responses_total{method="get_client",status="error"} 1')
+        assert_that(text).contains('shop_client_bytes_total{method="get_client",direction="sent"} 3')
+
+    def test_write_prometheus(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'metrics.prom')
+            self.metrics.observe('get_client', 0.05, 200)
+            self.metrics.write_prometheus(path)
+            with open(path) as exported:
+                assert_that(exported.read()).is_equal_to(self.metrics.to_prometheus())
+        finally:
+            shutil.rmtree(directory)
+
+    def test_client_records_requests(self):
+        with FakeShopServer() as server, Client(metrics=self.metrics) as client:
+            server.populate(clients=1, orders_per_client=1)
+            client.fake_api = server.url
+            client.get_client(1)
+            client.get_client(2)
+            client.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(self.metrics.status_count('get_client', 200)).is_equal_to(1)
+        assert_that(self.metrics.status_count('get_client', 404)).is_equal_to(1)
+        assert_that(self.metrics.bytes_count('get_client', 'received')).is_greater_than(0)
+        assert_that(self.metrics.bytes_count('add_client', 'sent')).is_greater_than(0)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_client_records_errors(self, mock_get):
+        mock_get.side_effect = ConnectionError('Error')
+        with Client(metrics=self.metrics) as client:
+            assert_that(client.get_client).raises(ConnectionError).when_called_with(1)
+        assert_that(self.metrics.status_count('get_client', 'error')).is_equal_to(1)
+
+    def tearDown(self) -> None:
+        self.metrics = None
@@ -30,7 +30,7 @@ class OrderTest(unittest.TestCase):
         spy_repo = Mock(OrderRepository)
         order = Order(spy_repo)
         order.get_order(1)
-        spy_repo.find_by_id.assert_has_calls([call(1), call(1)])
+        spy_repo.find_by_id.assert_called_once_with(1)
 
     def test_get_order_type_error(self):
         order = Order()
@@ -85,17 +85,24 @@ class OrderTest(unittest.TestCase):
         order = Order()
         assert_that(order.update_order).raises(ValueError).when_called_with(-1, self.model)
 
+    def test_update_order_to_existing_id(self):
+        spy_repo = Mock(OrderRepository)
+        spy_repo.find_by_id.return_value = OrderModel(2)
+        order = Order(spy_repo)
+        assert_that(order.update_order).raises(ValueError).when_called_with(1, OrderModel(2))
+        spy_repo.update.assert_not_called()
+
     def test_delete_order_return_existing_order(self):
         stub_repo = Mock(OrderRepository)
         order = Order(stub_repo)
-        stub_repo.find_by_id.return_value = self.model
+        stub_repo.delete_by_id.return_value = True
         response = order.delete_order(1)
         self.assertTrue(response)
 
     def test_delete_order_return_not_existing_order(self):
         stub_repo = Mock(OrderRepository)
         order = Order(stub_repo)
-        stub_repo.find_by_id.return_value = None
+        stub_repo.delete_by_id.return_value = False
         response = order.delete_order(1)
         assert_that(response).is_false()
 
@@ -103,8 +110,8 @@ class OrderTest(unittest.TestCase):
         spy_repo = Mock(OrderRepository)
         order = Order(spy_repo)
         order.delete_order(1)
-        spy_repo.delete.assert_called_once()
-        spy_repo.find_by_id.assert_has_calls([call(1), call(1)])
+        spy_repo.delete_by_id.assert_called_once_with(1)
+        spy_repo.find_by_id.assert_not_called()
 
     def test_delete_order_type_error(self):
         order = Order()
@@ -114,5 +121,86 @@ class OrderTest(unittest.TestCase):
         order = Order()
         assert_that(order.delete_order).raises(ValueError).when_called_with(-1)
 
+    def test_get_orders(self):
+        stub_repo = Mock(OrderRepository)
+        order = Order(stub_repo)
+        stub_repo.find_many.return_value = [self.model, None]
+        response = order.get_orders([1, 2])
+        assert_that(response).is_equal_to([self.model, 'missing'])
+
+    def test_get_orders_find_many_called_once(self):
+        spy_repo = Mock(OrderRepository)
+        order = Order(spy_repo)
+        spy_repo.find_many.return_value = [None, None, None]
+        order.get_orders(iter([1, 2, 3]))
+        spy_repo.find_many.assert_called_once_with([1, 2, 3])
+        spy_repo.find_by_id.assert_not_called()
+
+    def test_get_orders_invalid_ids(self):
+        spy_repo = Mock(OrderRepository)
+        order = Order(spy_repo)
+        spy_repo.find_many.return_value = [self.model, None]
+        response = order.get_orders(['id', 1, -1, 2, True])
+        assert_that(response).is_equal_to(['invalid', self.model, 'invalid', 'missing', 'invalid'])
+        spy_repo.find_many.assert_called_once_with([1, 2])
+
+    def test_get_orders_all_invalid(self):
+        spy_repo = Mock(OrderRepository)
+        order = Order(spy_repo)
+        assert_that(order.get_orders([None, -1])).is_equal_to(['invalid', 'invalid'])
+        spy_repo.find_many.assert_not_called()
+
+    def test_add_orders(self):
+        stub_repo = Mock(OrderRepository)
+        order = Order(stub_repo)
+        stub_repo.add_many.return_value = [True, False]
+        response = order.add_orders([self.model, self.model])
+        assert_that(response).is_equal_to(['inserted', 'duplicate'])
+
+    def test_add_orders_invalid_order(self):
+        spy_repo = Mock(OrderRepository)
+        order = Order(spy_repo)
+        spy_repo.add_many.return_value = [True]
+        response = order.add_orders(['Not order model', self.model])
+        assert_that(response).is_equal_to(['invalid', 'inserted'])
+        spy_repo.add_many.assert_called_once_with([self.model])
+
+    def test_upsert_orders(self):
+        stub_repo = Mock(OrderRepository)
+        order = Order(stub_repo)
+        stub_repo.upsert_many.return_value = [True, False]
+        response = order.upsert_orders([self.model, self.model])
+        assert_that(response).is_equal_to(['inserted', 'updated'])
+
+    def test_upsert_orders_invalid_order(self):
+        spy_repo = Mock(OrderRepository)
+        order = Order(spy_repo)
+        assert_that(order.upsert_orders([None])).is_equal_to(['invalid'])
+        spy_repo.upsert_many.assert_not_called()
+
+    def test_delete_orders(self):
+        stub_repo = Mock(OrderRepository)
+        order = Order(stub_repo)
+        stub_repo.delete_many.return_value = [True, False]
+        response = order.delete_orders([1, 2])
+        assert_that(response).is_equal_to(['deleted', 'missing'])
+
+    def test_delete_orders_invalid_id(self):
+        spy_repo = Mock(OrderRepository)
+        order = Order(spy_repo)
+        spy_repo.delete_many.return_value = [True]
+        response = order.delete_orders([1, -2])
+        assert_that(response).is_equal_to(['deleted', 'invalid'])
+        spy_repo.delete_many.assert_called_once_with([1])
+
+    def test_batch_on_repository(self):
+        order = Order(OrderRepository([self.model]))
+        other = OrderModel(2, 1, [])
+        assert_that(order.add_orders([self.model, other, 'order'])).is_equal_to(['duplicate', 'inserted', 'invalid'])
+        assert_that(order.upsert_orders([other, None, OrderModel(3, 1, [])])).is_equal_to(
+            ['updated', 'invalid', 'inserted'])
+        assert_that(order.get_orders([2, 4, '2'])).is_equal_to([other, 'missing', 'invalid'])
+        assert_that(order.delete_orders([2, 2, -1])).is_equal_to(['deleted', 'missing', 'invalid'])
+
     def tearDown(self) -> None:
         self.model = None
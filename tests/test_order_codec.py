@@ -0,0 +1,85 @@
+import io
+import unittest
+from assertpy import *
+from order import OrderCodec
+from order.OrderModel import OrderModel
+
+
+def fields(orders):
+    return [(order.order_id, order.client, order.items) for order in orders]
+
+
+class OrderCodecTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.orders = [OrderModel(1, 1, [{'name': 'name1', 'value': 10}, {'name': 'name2', 'value': 20.5}]),
+                       OrderModel(2, 3, [])]
+
+    def test_to_dict(self):
+        assert_that(OrderCodec.to_dict(self.orders[0])).is_equal_to(
+            {'order': {'items': [{'name': 'name1', 'value': 10}, {'name': 'name2', 'value': 20.5}],
+                       'order_id': 1, 'client_id': 1}})
+
+    def test_dicts_round_trip(self):
+        assert_that(fields(OrderCodec.from_dicts(OrderCodec.to_dicts(self.orders)))).is_equal_to(fields(self.orders))
+
+    def test_from_dict(self):
+        order = OrderCodec.from_dict({'order': {'items': [], 'order_id': 4, 'client_id': 2}})
+        assert_that([order.order_id, order.client, order.items]).is_equal_to([4, 2, []])
+
+    def test_ndjson_round_trip(self):
+        output = io.StringIO()
+        assert_that(OrderCodec.write_ndjson(iter(self.orders), output, chunk_size=1)).is_equal_to(2)
+        assert_that(output.getvalue().splitlines()).is_length(2)
+        lines = io.StringIO(output.getvalue() + '\n')
+        assert_that(fields(OrderCodec.read_ndjson(lines))).is_equal_to(fields(self.orders))
+
+    def test_binary_round_trip(self):
+        output = io.BytesIO()
+        assert_that(OrderCodec.write_binary(self.orders, output)).is_equal_to(2)
+        decoded = list(OrderCodec.read_binary(io.BytesIO(output.getvalue())))
+        assert_that(fields(decoded)).is_equal_to(fields(self.orders))
+        assert_that(decoded[0].items[0]['value']).is_instance_of(int)
+
+    def test_binary_is_smaller_than_ndjson(self):
+        binary, text = io.BytesIO(), io.StringIO()
+        OrderCodec.write_binary(self.orders, binary)
+        OrderCodec.write_ndjson(self.orders, text)
+        assert_that(len(binary.getvalue())).is_less_than(len(text.getvalue()))
+
+    def test_binary_truncated_stream(self):
+        data = OrderCodec.pack(self.orders[0])
+        stream = io.BytesIO(OrderCodec.RECORD_LENGTH.pack(len(data)) + data[:-1])
+        assert_that(list).raises(ValueError).when_called_with(OrderCodec.read_binary(stream))
+
+    def test_binary_unsupported_item(self):
+        assert_that(OrderCodec.pack).raises(ValueError).when_called_with(OrderModel(1, 1, [{'name': 'a'}]))
+
+    def test_binary_unsupported_client(self):
+        assert_that(OrderCodec.pack).raises(ValueError).when_called_with(OrderModel(1, 'client', []))
+
+    def test_binary_none_items(self):
+        output = io.BytesIO()
+        OrderCodec.write_binary([OrderModel(1, 1)], output)
+        assert_that(next(OrderCodec.read_binary(io.BytesIO(output.getvalue()))).items).is_equal_to([])
+
+    def test_binary_unsupported_values(self):
+        for value in (True, None, 'ten', 2 ** 63, -2 ** 63 - 1, [1]):
+            order = OrderModel(1, 1, [{'name': 'a', 'value': value}])
+            assert_that(OrderCodec.pack).raises(ValueError).when_called_with(order)
+
+    def test_binary_int64_bounds(self):
+        order = OrderModel(2 ** 63 - 1, -2 ** 63, [{'name': 'a', 'value': 2 ** 63 - 1}, {'name': 'b', 'value': -2 ** 63}])
+        decoded = OrderCodec.unpack(OrderCodec.pack(order))
+        assert_that(fields([decoded])).is_equal_to(fields([order]))
+
+    def test_binary_unsupported_ids(self):
+        for order_id, client in ((True, 1), (2 ** 63, 1), (1, None)):
+            assert_that(OrderCodec.pack).raises(ValueError).when_called_with(OrderModel(order_id, client, []))
+
+    def test_binary_unsupported_item_name(self):
+        assert_that(OrderCodec.pack).raises(ValueError).when_called_with(OrderModel(1, 1, [{'name': 1, 'value': 1}]))
+        assert_that(OrderCodec.pack).raises(ValueError).when_called_with(OrderModel(1, 1, ['item']))
+
+    def tearDown(self) -> None:
+        self.orders = None
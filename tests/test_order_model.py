@@ -0,0 +1,32 @@
+import unittest
+from assertpy import *
+from order.OrderModel import OrderModel
+
+
+class OrderModelTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.model = OrderModel(1, 2, [{'name': 'name1', 'value': 2}])
+
+    def test_fields(self):
+        assert_that(self.model.order_id).is_equal_to(1)
+        assert_that(self.model.client).is_equal_to(2)
+        assert_that(self.model.items).is_equal_to([{'name': 'name1', 'value': 2}])
+
+    def test_fields_are_writable(self):
+        self.model.client = 3
+        assert_that(self.model.client).is_equal_to(3)
+
+    def test_defaults(self):
+        model = OrderModel()
+        assert_that([model.order_id, model.client, model.items]).is_equal_to([None, None, None])
+
+    def test_has_no_instance_dict(self):
+        assert_that(hasattr(self.model, '__dict__')).is_false()
+
+    def test_unknown_attribute_error(self):
+        with self.assertRaises(AttributeError):
+            self.model.total = 10
+
+    def tearDown(self) -> None:
+        self.model = None
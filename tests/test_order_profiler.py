@@ -0,0 +1,62 @@
+import io
+import unittest
+from assertpy import *
+from order.Order import Order
+from order.OrderModel import OrderModel
+from order.OrderProfiler import OrderProfiler, ProfiledOrderRepository, percentile
+from order.OrderRepository import OrderRepository
+
+
+class OrderProfilerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.repository = OrderRepository([OrderModel(1, 1, []), OrderModel(2, 1, [])])
+        self.order = Order(self.repository)
+        self.profiler = OrderProfiler(self.order)
+
+    def test_counts_repository_calls_per_service_call(self):
+        self.order.get_order(1)
+        self.order.get_order(3)
+        self.order.delete_order(2)
+        assert_that(self.profiler.service['get_order'].calls).is_equal_to(2)
+        assert_that(self.profiler.service['get_order'].repository_calls).is_equal_to(2)
+        assert_that(self.profiler.service['delete_order'].repository_calls).is_equal_to(1)
+        assert_that(self.profiler.repository['find_by_id'].calls).is_equal_to(2)
+
+    def test_records_orders_touched_by_batches(self):
+        self.order.add_orders(iter([OrderModel(3, 1, []), OrderModel(4, 1, [])]))
+        self.order.get_orders([1, 2, 3])
+        assert_that(self.profiler.repository['add_many'].items).is_equal_to(2)
+        assert_that(self.profiler.repository['find_many'].items).is_equal_to(3)
+        assert_that(self.repository.find_by_id(4)).is_not_none()
+
+    def test_validation_errors_are_profiled(self):
+        assert_that(self.order.get_order).raises(TypeError).when_called_with('id')
+        assert_that(self.profiler.service['get_order'].repository_calls).is_equal_to(0)
+
+    def test_detach(self):
+        self.profiler.detach()
+        self.order.get_order(1)
+        assert_that(self.order.order_repository).is_same_as(self.repository)
+        assert_that(self.profiler.service).is_empty()
+
+    def test_repository_proxy(self):
+        repository = ProfiledOrderRepository(self.repository)
+        assert_that(repository.data_source).is_length(2)
+        assert_that(repository.find_by_client(1)).is_length(2)
+        assert_that(repository.profiler.repository['find_by_client'].items).is_equal_to(2)
+        assert_that(repository.profiler.repository['data_source'].items).is_equal_to(2)
+
+    def test_dump(self):
+        self.order.get_order(1)
+        output = io.StringIO()
+        self.profiler.dump(output)
+        assert_that(output.getvalue()).contains('order.get_order', 'repository.find_by_id')
+
+    def test_percentile(self):
+        assert_that(percentile([3, 1, 2, 4], 0.5)).is_equal_to(3)
+        assert_that(percentile([3, 1, 2, 4], 0.99)).is_equal_to(4)
+        assert_that(percentile([], 0.5)).is_equal_to(0.0)
+
+    def tearDown(self) -> None:
+        self.profiler.detach()
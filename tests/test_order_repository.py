@@ -0,0 +1,139 @@
+import unittest
+from assertpy import *
+from order.Order import Order
+from order.OrderRepository import OrderRepository
+from order.OrderModel import OrderModel
+
+
+class OrderRepositoryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.first = OrderModel(1, 1, [{'name': 'name1', 'value': 2}])
+        self.second = OrderModel(2, 1, [{'name': 'name2', 'value': 5}])
+        self.repository = OrderRepository([self.first, self.second])
+
+    def test_find_by_id(self):
+        assert_that(self.repository.find_by_id(2)).is_same_as(self.second)
+
+    def test_find_by_id_not_existing(self):
+        assert_that(self.repository.find_by_id(3)).is_none()
+
+    def test_add(self):
+        order = OrderModel(3, 2, [])
+        assert_that(self.repository.add(order)).is_true()
+        assert_that(self.repository.find_by_id(3)).is_same_as(order)
+
+    def test_add_duplicate_id(self):
+        assert_that(self.repository.add(OrderModel(1, 2, []))).is_false()
+        assert_that(self.repository.find_by_id(1)).is_same_as(self.first)
+
+    def test_delete(self):
+        self.repository.delete(self.first)
+        assert_that(self.repository.find_by_id(1)).is_none()
+        assert_that(self.repository.data_source).is_equal_to([self.second])
+
+    def test_delete_not_existing(self):
+        assert_that(self.repository.delete).raises(ValueError).when_called_with(OrderModel(5, 1, []))
+
+    def test_delete_by_id(self):
+        assert_that(self.repository.delete_by_id(1)).is_true()
+        assert_that(self.repository.find_by_id(1)).is_none()
+
+    def test_delete_by_id_not_existing(self):
+        assert_that(self.repository.delete_by_id(3)).is_false()
+
+    def test_update(self):
+        new_order = OrderModel(1, 3, [])
+        assert_that(self.repository.update(1, new_order)).is_true()
+        assert_that(self.repository.find_by_id(1)).is_same_as(new_order)
+
+    def test_update_not_existing(self):
+        assert_that(self.repository.update(7, OrderModel(7, 1, []))).is_false()
+
+    def test_update_order_to_existing_id(self):
+        order = Order(self.repository)
+        assert_that(order.update_order).raises(ValueError).when_called_with(1, OrderModel(2, 5, []))
+        assert_that(self.repository.find_by_id(1)).is_not_none()
+        assert_that(self.repository.find_by_id(2).client).is_equal_to(1)
+
+    def test_upsert_inserts(self):
+        order = OrderModel(3, 1, [])
+        assert_that(self.repository.upsert(order)).is_true()
+        assert_that(self.repository.find_by_id(3)).is_same_as(order)
+
+    def test_upsert_replaces(self):
+        order = OrderModel(1, 4, [])
+        assert_that(self.repository.upsert(order)).is_false()
+        assert_that(self.repository.find_by_id(1)).is_same_as(order)
+
+    def test_find_many(self):
+        assert_that(self.repository.find_many([2, 5, 1])).is_equal_to([self.second, None, self.first])
+
+    def test_add_many(self):
+        third = OrderModel(3, 1, [])
+        assert_that(self.repository.add_many([third, OrderModel(1, 1, []), OrderModel(3, 1, [])])) \
+            .is_equal_to([True, False, False])
+        assert_that(self.repository.find_by_id(3)).is_same_as(third)
+
+    def test_delete_many(self):
+        assert_that(self.repository.delete_many([1, 4, 1])).is_equal_to([True, False, False])
+        assert_that(self.repository.data_source).is_equal_to([self.second])
+
+    def test_upsert_many(self):
+        assert_that(self.repository.upsert_many([OrderModel(2, 1, []), OrderModel(3, 1, [])])) \
+            .is_equal_to([False, True])
+
+    def test_find_by_client(self):
+        third = OrderModel(3, 2, [])
+        self.repository.add(third)
+        assert_that(self.repository.find_by_client(1)).is_equal_to([self.first, self.second])
+        assert_that(self.repository.find_by_client(2)).is_equal_to([third])
+        assert_that(self.repository.find_by_client(9)).is_empty()
+
+    def test_count_by_client(self):
+        assert_that(self.repository.count_by_client(1)).is_equal_to(2)
+        assert_that(self.repository.count_by_client(9)).is_equal_to(0)
+
+    def test_client_index_after_delete(self):
+        self.repository.delete(self.first)
+        self.repository.delete_by_id(2)
+        assert_that(self.repository.count_by_client(1)).is_equal_to(0)
+
+    def test_client_index_after_update_to_other_client(self):
+        self.repository.update(1, OrderModel(1, 2, []))
+        assert_that(self.repository.find_by_client(1)).is_equal_to([self.second])
+        assert_that(self.repository.count_by_client(2)).is_equal_to(1)
+
+    def test_client_index_after_upsert_of_changed_order(self):
+        self.first.client = 3
+        self.repository.upsert(self.first)
+        assert_that(self.repository.find_by_client(1)).is_equal_to([self.second])
+        assert_that(self.repository.find_by_client(3)).is_equal_to([self.first])
+
+    def test_data_source_keeps_insertion_order(self):
+        order = OrderModel(0, 1, [])
+        self.repository.add(order)
+        assert_that(self.repository.data_source).is_equal_to([self.first, self.second, order])
+
+    def test_default_data_source_is_not_shared(self):
+        OrderRepository().add(OrderModel(1, 1, []))
+        assert_that(OrderRepository().data_source).is_empty()
+
+    def test_duplicate_ids_in_data_source_keep_first(self):
+        repository = OrderRepository([self.first, OrderModel(1, 9, [])])
+        assert_that(repository.find_by_id(1)).is_same_as(self.first)
+
+    def test_unhashable_client_changes_nothing(self):
+        repository = OrderRepository()
+        assert_that(repository.add).raises(TypeError).when_called_with(OrderModel(1, {'id': 7}, []))
+        assert_that(repository.find_by_id(1)).is_none()
+        assert_that(repository.add(OrderModel(1, 7, []))).is_true()
+        assert_that(repository.upsert).raises(TypeError).when_called_with(OrderModel(1, {'id': 7}, []))
+        assert_that(repository.find_by_client(7)[0].client).is_equal_to(7)
+        assert_that(repository.delete_by_id(1)).is_true()
+
+    def test_iter_orders(self):
+        assert_that(list(self.repository.iter_orders())).is_equal_to(self.repository.data_source)
+
+    def tearDown(self) -> None:
+        self.repository = None
@@ -0,0 +1,156 @@
+import unittest
+from unittest.mock import *
+from assertpy import *
+import requests
+from client.cache import ResponseCache
+from fake_api.server import FakeShopServer
+from order.Order import Order
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderListingError
+from order.RemoteOrderRepository import RemoteOrderRepository
+
+
+class RemoteOrderRepositoryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = FakeShopServer().start()
+        client_id = self.server.add_client('olekwardyn@gmail.com', 'Olek', 'Wardyn')
+        self.order_id = self.server.add_order(client_id, [{'name': 'name1', 'value': 2}])
+        self.now = [0]
+        self.cache = ResponseCache(max_size=10, ttl=60, clock=lambda: self.now[0])
+        self.repository = RemoteOrderRepository(self.server.orders_url, self.cache, negative_ttl=5,
+                                                clients_url=self.server.url)
+
+    def put_remotely(self, order_id):
+        self.server.handle('PUT', '/api/orders/{}'.format(order_id), {},
+                           {'order': {'items': [], 'order_id': order_id, 'client_id': 1}})
+
+    def test_find_by_id(self):
+        order = self.repository.find_by_id(self.order_id)
+        assert_that(order).is_instance_of(OrderModel)
+        assert_that([order.order_id, order.client, order.items]).is_equal_to(
+            [self.order_id, 1, [{'name': 'name1', 'value': 2}]])
+
+    def test_find_by_id_served_from_cache(self):
+        self.repository.find_by_id(self.order_id)
+        requests_made = self.server.requests
+        self.repository.find_by_id(self.order_id)
+        assert_that(self.server.requests).is_equal_to(requests_made)
+        assert_that(self.cache.stats()['hits']).is_equal_to(1)
+
+    def test_find_by_id_expired(self):
+        self.repository.find_by_id(self.order_id)
+        self.now[0] = 61
+        requests_made = self.server.requests
+        self.repository.find_by_id(self.order_id)
+        assert_that(self.server.requests).is_equal_to(requests_made + 1)
+
+    def test_find_by_id_not_existing_cached(self):
+        assert_that(self.repository.find_by_id(99)).is_none()
+        requests_made = self.server.requests
+        assert_that(self.repository.find_by_id(99)).is_none()
+        assert_that(self.server.requests).is_equal_to(requests_made)
+
+    def test_find_by_id_negative_entry_expires(self):
+        self.repository.find_by_id(99)
+        self.put_remotely(99)
+        self.now[0] = 6
+        assert_that(self.repository.find_by_id(99)).is_not_none()
+
+    def test_find_by_id_server_error(self):
+        self.server.error_rate = 1
+        assert_that(self.repository.find_by_id).raises(requests.HTTPError).when_called_with(self.order_id)
+        assert_that(len(self.cache)).is_equal_to(0)
+
+    def test_add(self):
+        assert_that(self.repository.add(OrderModel(10, 1, []))).is_true()
+        assert_that(self.server.order_index[10]).is_equal_to({'order_id': 10, 'client_id': 1, 'items': []})
+        assert_that(self.repository.add(OrderModel(10, 2, []))).is_false()
+
+    def test_add_replaces_negative_entry(self):
+        self.repository.find_by_id(10)
+        self.repository.add(OrderModel(10, 1, []))
+        assert_that(self.repository.find_by_id(10)).is_not_none()
+
+    def test_upsert(self):
+        assert_that(self.repository.upsert(OrderModel(10, 1, []))).is_true()
+        assert_that(self.repository.upsert(OrderModel(10, 2, []))).is_false()
+        assert_that(self.server.order_index[10]['client_id']).is_equal_to(2)
+
+    def test_update(self):
+        assert_that(self.repository.update(self.order_id, OrderModel(self.order_id, 1, []))).is_true()
+        assert_that(self.server.order_index[self.order_id]['items']).is_empty()
+        assert_that(self.repository.find_by_id(self.order_id).items).is_empty()
+
+    def test_update_changing_order_id(self):
+        self.repository.update(self.order_id, OrderModel(20, 1, []))
+        assert_that(self.repository.find_by_id(self.order_id)).is_none()
+        assert_that(self.server.order_index).contains_key(20).does_not_contain_key(self.order_id)
+
+    def test_update_not_existing(self):
+        assert_that(self.repository.update(99, OrderModel(99, 1, []))).is_false()
+
+    def test_update_order_to_existing_id(self):
+        self.put_remotely(20)
+        order = Order(self.repository)
+        assert_that(order.update_order).raises(ValueError).when_called_with(self.order_id, OrderModel(20, 5, []))
+        assert_that(self.server.order_index).contains_key(self.order_id)
+        assert_that(self.server.order_index[20]['client_id']).is_equal_to(1)
+
+    def test_delete_by_id(self):
+        self.repository.find_by_id(self.order_id)
+        assert_that(self.repository.delete_by_id(self.order_id)).is_true()
+        assert_that(self.repository.find_by_id(self.order_id)).is_none()
+        assert_that(self.repository.delete_by_id(self.order_id)).is_false()
+
+    def test_delete_not_existing(self):
+        assert_that(self.repository.delete).raises(ValueError).when_called_with(OrderModel(99, 1, []))
+
+    def test_failed_write_drops_cached_order(self):
+        self.repository.find_by_id(self.order_id)
+        self.server.error_rate = 1
+        assert_that(self.repository.upsert).raises(requests.HTTPError).when_called_with(
+            OrderModel(self.order_id, 2, []))
+        self.server.error_rate = 0
+        assert_that(self.repository.find_by_id(self.order_id).client).is_equal_to(1)
+
+    def test_invalidate(self):
+        self.repository.find_by_id(99)
+        self.put_remotely(99)
+        self.repository.invalidate(99)
+        assert_that(self.repository.find_by_id(99)).is_not_none()
+
+    def test_find_by_client(self):
+        second_id = self.server.add_order(1, [])
+        orders = self.repository.find_by_client(1)
+        assert_that([(order.order_id, order.client) for order in orders]).is_equal_to(
+            [(self.order_id, 1), (second_id, 1)])
+        requests_made = self.server.requests
+        assert_that(self.repository.find_by_id(second_id)).is_same_as(orders[1])
+        assert_that(self.server.requests).is_equal_to(requests_made)
+
+    def test_find_by_client_not_existing(self):
+        assert_that(self.repository.find_by_client(99)).is_empty()
+
+    def test_count_by_client(self):
+        assert_that(self.repository.count_by_client(1)).is_equal_to(1)
+        assert_that(self.repository.count_by_client(99)).is_equal_to(0)
+
+    def test_data_source_not_supported(self):
+        assert_that(getattr).raises(OrderListingError).when_called_with(self.repository, 'data_source')
+
+    def test_get_order_through_order(self):
+        order = Order(self.repository)
+        assert_that(order.get_order(self.order_id).order_id).is_equal_to(self.order_id)
+        assert_that(order.get_order(99)).is_equal_to('Item does not exist')
+
+    def test_default_cache_and_owned_session(self):
+        session = Mock(requests.Session)
+        repository = RemoteOrderRepository(session=session)
+        assert_that(repository.cache).is_instance_of(ResponseCache)
+        repository.close()
+        session.close.assert_not_called()
+
+    def tearDown(self) -> None:
+        self.repository.close()
+        self.server.stop()
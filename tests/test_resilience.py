@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import *
+from assertpy import *
+import requests
+from client.client import Client
+from client.metrics import ClientMetrics
+from client.resilience import CircuitBreaker, CircuitBreakers, CircuitOpenError, RetryPolicy
+from fake_api.server import FakeShopServer
+
+
+def response(status_code, json=None):
+    return Mock(status_code=status_code, json=json)
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_delay_grows_exponentially_up_to_max(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1, random=lambda: 1)
+        assert_that([policy.delay(attempt) for attempt in range(5)]).is_equal_to([0.1, 0.2, 0.4, 0.8, 1])
+
+    def test_delay_jitter(self):
+        policy = RetryPolicy(base_delay=1, random=lambda: 0.25)
+        assert_that(policy.delay(1)).is_equal_to(0.5)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(attempts=2)
+        assert_that(policy.should_retry(0, response(503))).is_true()
+        assert_that(policy.should_retry(0, response(404))).is_false()
+        assert_that(policy.should_retry(0, error=requests.ConnectionError())).is_true()
+        assert_that(policy.should_retry(0, error=ValueError())).is_false()
+        assert_that(policy.should_retry(1, response(503))).is_false()
+
+    def test_attempts_value_error(self):
+        assert_that(RetryPolicy).raises(ValueError).when_called_with(0)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = [0]
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: self.now[0])
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure()
+        assert_that(self.breaker.state).is_equal_to('closed')
+        self.breaker.record_failure()
+        assert_that(self.breaker.state).is_equal_to('open')
+        assert_that(self.breaker.allow()).is_false()
+        assert_that(self.breaker.rejected).is_equal_to(1)
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        assert_that(self.breaker.state).is_equal_to('closed')
+
+    def test_half_open_allows_single_trial(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now[0] = 10
+        assert_that(self.breaker.state).is_equal_to('half-open')
+        assert_that([self.breaker.allow(), self.breaker.allow()]).is_equal_to([True, False])
+        self.breaker.record_success()
+        assert_that(self.breaker.state).is_equal_to('closed')
+
+    def test_failed_trial_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now[0] = 10
+        self.breaker.allow()
+        self.breaker.record_failure()
+        assert_that(self.breaker.state).is_equal_to('open')
+        self.now[0] = 19
+        assert_that(self.breaker.allow()).is_false()
+
+    def test_breakers_per_endpoint(self):
+        breakers = CircuitBreakers(failure_threshold=1)
+        breakers.for_endpoint('get_client').record_failure()
+        assert_that(breakers.for_endpoint('get_client')).is_same_as(breakers.for_endpoint('get_client'))
+        assert_that(breakers.states()).is_equal_to({'get_client': 'open'})
+        assert_that(breakers.for_endpoint('get_clients').state).is_equal_to('closed')
+
+
+class ClientResilienceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.sleep = Mock()
+        self.metrics = ClientMetrics()
+        self.client = Client(metrics=self.metrics,
+                             retry_policy=RetryPolicy(attempts=3, base_delay=0.1, random=lambda: 1, sleep=self.sleep))
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_retried_after_server_error(self, mock_get):
+        mock_get.side_effect = [response(503), response(200, {'id': 1})]
+        assert_that(self.client.get_client(1)).is_equal_to({'id': 1})
+        self.sleep.assert_called_once_with(0.1)
+        assert_that(self.metrics.retry_count('get_client')).is_equal_to(1)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_get_client_gives_up_after_attempts(self, mock_get):
+        mock_get.return_value = response(500)
+        assert_that(self.client.get_client(1)).is_equal_to('Something went horribly wrong')
+        assert_that(mock_get.call_count).is_equal_to(3)
+        assert_that([call.args[0] for call in self.sleep.call_args_list]).is_equal_to([0.1, 0.2])
+
+    @patch('src.client.client.requests.Session.get')
+    def test_connection_error_retried(self, mock_get):
+        mock_get.side_effect = [requests.ConnectionError('down'), response(200, {'orders': []})]
+        assert_that(self.client.get_client_orders(1).status_code).is_equal_to(200)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_client_error_not_retried(self, mock_get):
+        mock_get.return_value = response(404)
+        assert_that(self.client.get_client(1)).is_equal_to('User does not exist')
+        assert_that(mock_get.call_count).is_equal_to(1)
+
+    @patch('src.client.client.requests.Session.post')
+    def test_add_client_not_retried(self, mock_post):
+        mock_post.return_value = response(503)
+        self.client.add_client({'name': 'Olek', 'surname': 'Wardyn', 'email': 'olekwardyn@gmail.com'})
+        assert_that(mock_post.call_count).is_equal_to(1)
+
+    @patch('src.client.client.requests.Session.delete')
+    def test_delete_client_retried(self, mock_delete):
+        mock_delete.side_effect = [requests.Timeout('slow'), response(200, {'deleted_id': 1})]
+        assert_that(self.client.delete_client(1).status_code).is_equal_to(200)
+
+    @patch('src.client.client.requests.Session.get')
+    def test_circuit_opens_and_fails_fast(self, mock_get):
+        mock_get.return_value = response(500)
+        client = Client(breakers=CircuitBreakers(failure_threshold=2, reset_timeout=60))
+        client.get_client(1)
+        client.get_client(2)
+        assert_that(client.get_client).raises(CircuitOpenError).when_called_with(3)
+        assert_that(mock_get.call_count).is_equal_to(2)
+        assert_that(client.get_clients_by_ids([4])[0]).is_instance_of(requests.RequestException)
+        mock_get.return_value = response(200, {'orders': []})
+        assert_that(client.get_client_orders(1).status_code).is_equal_to(200)
+        client.close()
+
+    def test_retries_against_fake_api(self):
+        with FakeShopServer(error_rate=0.5, seed=3) as server:
+            server.populate(clients=5, orders_per_client=1, items_per_order=1)
+            self.client.retry_policy.attempts = 10
+            self.client.fake_api = server.url
+            assert_that([self.client.get_client(client_id)['id'] for client_id in range(1, 6)]).is_equal_to(
+                [1, 2, 3, 4, 5])
+        assert_that(self.metrics.retry_count('get_client')).is_greater_than(0)
+
+    def tearDown(self) -> None:
+        self.client.close()
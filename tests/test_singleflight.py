@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+import unittest
+from assertpy import *
+from client.async_client import AsyncClient, aiohttp
+from client.client import Client
+from client.singleflight import SingleFlight, AsyncSingleFlight
+from fake_api.server import FakeShopServer
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.flight = SingleFlight()
+
+    def run_concurrently(self, function, count=5):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.flight.do('key', function)))
+                   for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_share_one_execution(self):
+        executions = []
+
+        def slow():
+            executions.append(1)
+            time.sleep(0.1)
+            return 'result'
+
+        results = self.run_concurrently(slow)
+        assert_that(results).is_equal_to(['result'] * 5)
+        assert_that(executions).is_length(1)
+        assert_that(self.flight.stats()).is_equal_to({'calls': 5, 'coalesced': 4})
+
+    def test_sequential_calls_are_not_coalesced(self):
+        self.flight.do('key', lambda: 1)
+        assert_that(self.flight.do('key', lambda: 2)).is_equal_to(2)
+        assert_that(self.flight.coalesced).is_equal_to(0)
+
+    def test_error_is_shared(self):
+        started = threading.Event()
+        errors = []
+
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise ConnectionError('Error')
+
+        def waiter():
+            started.wait()
+            try:
+                self.flight.do('key', lambda: 'never called')
+            except ConnectionError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        assert_that(self.flight.do).raises(ConnectionError).when_called_with('key', failing)
+        thread.join()
+        assert_that(errors).is_length(1)
+
+    def test_async_calls_share_one_task(self):
+        flight = AsyncSingleFlight()
+        executions = []
+
+        async def slow():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return 'result'
+
+        async def run():
+            return await asyncio.gather(*[flight.do('key', slow) for _ in range(5)])
+
+        assert_that(asyncio.run(run())).is_equal_to(['result'] * 5)
+        assert_that(executions).is_length(1)
+        assert_that(flight.stats()).is_equal_to({'calls': 5, 'coalesced': 4})
+
+    def test_client_coalesces_get_client(self):
+        with FakeShopServer(latency=0.1) as server, Client(coalesce=True) as client:
+            server.populate(clients=1, orders_per_client=0)
+            client.fake_api = server.url
+            response = client.get_clients_by_ids([1] * 5, max_workers=5)
+            assert_that(response).is_length(5)
+            assert_that(set(client['id'] for client in response)).is_equal_to({1})
+            assert_that(server.requests).is_equal_to(1)
+            assert_that(client.single_flight.coalesced).is_equal_to(4)
+
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async_client_coalesces_get_client_orders(self):
+        async def fetch(url):
+            async with AsyncClient(coalesce=True) as client:
+                client.fake_api = url
+                return await asyncio.gather(*[client.get_client_orders(1) for _ in range(5)])
+
+        with FakeShopServer(latency=0.05) as server:
+            server.populate(clients=1, orders_per_client=2)
+            response = asyncio.run(fetch(server.url))
+            assert_that(set(r.status_code for r in response)).is_equal_to({200})
+            assert_that(server.requests).is_equal_to(1)
+
+    def tearDown(self) -> None:
+        self.flight = None
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+from assertpy import *
+from order.Order import Order
+from order.OrderModel import OrderModel
+from order.SqliteOrderRepository import SqliteOrderRepository
+
+
+class SqliteOrderRepositoryTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.repository = SqliteOrderRepository()
+        self.repository.add(OrderModel(2, 1, [{'name': 'name2', 'value': 5}]))
+        self.repository.add(OrderModel(1, 1, [{'name': 'name1', 'value': 2}]))
+
+    def test_find_by_id(self):
+        order = self.repository.find_by_id(2)
+        assert_that([order.order_id, order.client, order.items]).is_equal_to([2, 1, [{'name': 'name2', 'value': 5}]])
+
+    def test_find_by_id_not_existing(self):
+        assert_that(self.repository.find_by_id(3)).is_none()
+
+    def test_add_duplicate_id(self):
+        assert_that(self.repository.add(OrderModel(1, 2, []))).is_false()
+        assert_that(self.repository.find_by_id(1).client).is_equal_to(1)
+
+    def test_delete(self):
+        self.repository.delete(OrderModel(1))
+        assert_that(self.repository.find_by_id(1)).is_none()
+
+    def test_delete_not_existing(self):
+        assert_that(self.repository.delete).raises(ValueError).when_called_with(OrderModel(5, 1, []))
+
+    def test_update(self):
+        assert_that(self.repository.update(1, OrderModel(1, 3, []))).is_true()
+        assert_that(self.repository.find_by_id(1).client).is_equal_to(3)
+
+    def test_update_not_existing(self):
+        assert_that(self.repository.update(7, OrderModel(7, 1, []))).is_false()
+        assert_that(self.repository.find_by_id(7)).is_none()
+
+    def test_update_order_to_existing_id(self):
+        order = Order(self.repository)
+        assert_that(order.update_order).raises(ValueError).when_called_with(1, OrderModel(2, 5, []))
+        assert_that(self.repository.find_by_id(1)).is_not_none()
+        assert_that(self.repository.find_by_id(2).client).is_equal_to(1)
+
+    def test_upsert(self):
+        assert_that(self.repository.upsert(OrderModel(1, 4, []))).is_false()
+        assert_that(self.repository.upsert(OrderModel(3, 4, []))).is_true()
+
+    def test_bulk_operations(self):
+        assert_that(self.repository.add_many([OrderModel(3, 1, []), OrderModel(1, 1, []), OrderModel(3, 2, [])])) \
+            .is_equal_to([True, False, False])
+        assert_that(self.repository.upsert_many([OrderModel(4, 1, []), OrderModel(4, 2, [])])).is_equal_to([True, False])
+        assert_that(self.repository.find_many([4, 9])[0].client).is_equal_to(2)
+        assert_that(self.repository.delete_many([4, 4, 9])).is_equal_to([True, False, False])
+        assert_that([order.order_id for order in self.repository.data_source]).is_equal_to([1, 2, 3])
+
+    def test_order_service(self):
+        order = Order(self.repository)
+        assert_that(order.get_order(2).items).is_equal_to([{'name': 'name2', 'value': 5}])
+        assert_that(order.delete_order(2)).is_true()
+        assert_that(order.get_order(2)).is_equal_to('Item does not exist')
+
+    def test_persists_between_connections(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'orders.db')
+            with SqliteOrderRepository(path) as repository:
+                repository.add_many([OrderModel(1, 1, []), OrderModel(2, 1, [])])
+            with SqliteOrderRepository(path) as repository:
+                assert_that(repository.find_by_id(2).order_id).is_equal_to(2)
+                journal_mode = repository.connection.execute('PRAGMA journal_mode').fetchone()[0]
+                assert_that(journal_mode).is_equal_to('wal')
+        finally:
+            shutil.rmtree(directory)
+
+    def test_client_index(self):
+        self.repository.add(OrderModel(3, 2, []))
+        assert_that([order.order_id for order in self.repository.find_by_client(1)]).is_equal_to([1, 2])
+        self.repository.update(1, OrderModel(1, 2, []))
+        assert_that(self.repository.count_by_client(1)).is_equal_to(1)
+        assert_that(self.repository.count_by_client(2)).is_equal_to(2)
+        assert_that(self.repository.find_by_client(9)).is_empty()
+
+    def test_add_order_id_not_integer(self):
+        for order_id in (None, 'id', 1.5):
+            assert_that(self.repository.add).raises(TypeError).when_called_with(OrderModel(order_id, 1, []))
+        assert_that(self.repository.upsert).raises(TypeError).when_called_with(OrderModel(None, 1, []))
+        assert_that(self.repository.update).raises(TypeError).when_called_with(1, OrderModel(None, 1, []))
+        assert_that([order.order_id for order in self.repository.data_source]).is_equal_to([1, 2])
+
+    def test_iter_orders(self):
+        orders = self.repository.iter_orders()
+        assert_that(next(orders).order_id).is_equal_to(1)
+        assert_that([order.order_id for order in orders]).is_equal_to([2])
+
+    def tearDown(self) -> None:
+        self.repository.close()
@@ -0,0 +1,160 @@
+import threading
+import time
+import unittest
+from unittest.mock import *
+from assertpy import *
+import requests
+from fake_api.server import FakeShopServer
+from order.OrderModel import OrderModel
+from order.OrderRepository import OrderRepository
+from order.WriteBehindOrder import WriteBehindOrder
+
+
+class WriteBehindOrderTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.session = Mock(requests.Session)
+        self.repository = OrderRepository()
+        self.order = WriteBehindOrder(self.repository, batch_size=3, flush_interval=60, session=self.session)
+
+    def sent(self):
+        return [call.kwargs['json']['operations'] for call in self.session.post.call_args_list]
+
+    def test_add_order_applied_locally(self):
+        self.order.add_order(OrderModel(1, 1, []))
+        assert_that(self.repository.find_by_id(1)).is_not_none()
+        assert_that(self.order.pending).contains_key(1)
+        self.session.post.assert_not_called()
+
+    def test_repeated_writes_collapse(self):
+        self.order.add_order(OrderModel(1, 1, []))
+        self.order.update_order(1, OrderModel(1, 2, [{'name': 'name1', 'value': 2}]))
+        self.order.update_order(1, OrderModel(1, 3, []))
+        self.order.flush()
+        assert_that(self.sent()).is_equal_to([[{'order': {'items': [], 'order_id': 1, 'client_id': 3}, 'op': 'put'}]])
+        assert_that(self.order.stats()).is_equal_to({'writes': 3, 'collapsed': 2, 'batches': 1, 'sent': 1, 'pending': 0})
+
+    def test_delete_after_add_sends_delete(self):
+        self.order.add_order(OrderModel(1, 1, []))
+        self.order.delete_order(1)
+        self.order.flush()
+        assert_that(self.sent()).is_equal_to([[{'op': 'delete', 'order_id': 1}]])
+
+    def test_failed_local_write_not_queued(self):
+        self.order.add_order(OrderModel(1, 1, []))
+        self.order.flush()
+        self.order.add_order(OrderModel(1, 2, []))
+        self.order.update_order(5, OrderModel(5, 1, []))
+        self.order.delete_order(6)
+        assert_that(self.order.pending).is_empty()
+
+    def test_update_changing_order_id(self):
+        self.order.add_order(OrderModel(1, 1, []))
+        self.order.flush()
+        self.order.update_order(1, OrderModel(2, 1, []))
+        assert_that(list(self.order.pending.items())).is_equal_to([(1, ('delete', None)), (2, ('put', ANY))])
+
+    def test_update_to_existing_order_id(self):
+        self.order.add_orders([OrderModel(1, 1, []), OrderModel(2, 9, [])])
+        self.order.flush()
+        assert_that(self.order.update_order).raises(ValueError).when_called_with(1, OrderModel(2, 5, []))
+        assert_that(self.repository.find_by_id(1)).is_not_none()
+        assert_that(self.repository.find_by_id(2).client).is_equal_to(9)
+        assert_that(self.order.pending).is_empty()
+
+    def test_flush_in_batches(self):
+        self.order.add_orders([OrderModel(order_id, 1, []) for order_id in range(7)])
+        self.order.flush()
+        assert_that([len(operations) for operations in self.sent()]).is_equal_to([3, 3, 1])
+
+    def test_batch_methods(self):
+        self.order.add_orders([OrderModel(1, 1, []), OrderModel(2, 1, [])])
+        self.order.upsert_orders([OrderModel(2, 2, []), OrderModel(3, 1, [])])
+        self.order.delete_orders([1, 9])
+        assert_that([(order_id, op) for order_id, (op, order) in self.order.pending.items()]).is_equal_to(
+            [(1, 'delete'), (2, 'put'), (3, 'put')])
+
+    def test_batch_methods_skip_invalid(self):
+        assert_that(self.order.add_orders([None, OrderModel(1, 1, [])])).is_equal_to(['invalid', 'inserted'])
+        assert_that(self.order.upsert_orders(['order'])).is_equal_to(['invalid'])
+        assert_that(self.order.delete_orders([-1, 2])).is_equal_to(['invalid', 'missing'])
+        assert_that(list(self.order.pending)).is_equal_to([1])
+
+    def test_background_flush_on_batch_size(self):
+        self.order.add_orders([OrderModel(order_id, 1, []) for order_id in range(3)])
+        deadline = time.monotonic() + 2
+        while self.session.post.call_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert_that(self.sent()).is_length(1)
+
+    def test_background_flush_on_interval(self):
+        order = WriteBehindOrder(OrderRepository(), batch_size=100, flush_interval=0.05, session=self.session)
+        order.add_order(OrderModel(1, 1, []))
+        time.sleep(0.3)
+        assert_that(order.pending).is_empty()
+        order.close()
+
+    def test_failed_flush_requeued(self):
+        self.session.post.side_effect = requests.ConnectionError('down')
+        self.order.add_order(OrderModel(1, 1, []))
+        self.order.add_order(OrderModel(2, 1, []))
+        assert_that(self.order.flush).raises(requests.ConnectionError).when_called_with()
+        assert_that(list(self.order.pending)).is_equal_to([1, 2])
+
+    def test_failed_flush_keeps_newer_change(self):
+        def fail(*args, **kwargs):
+            self.order.delete_order(1)
+            raise requests.ConnectionError('down')
+
+        self.session.post.side_effect = fail
+        self.order.add_order(OrderModel(1, 1, []))
+        assert_that(self.order.flush).raises(requests.ConnectionError).when_called_with()
+        assert_that(self.order.pending[1]).is_equal_to(('delete', None))
+
+    def test_http_error_requeued(self):
+        self.session.post.return_value.raise_for_status.side_effect = requests.HTTPError('500')
+        self.order.add_order(OrderModel(1, 1, []))
+        assert_that(self.order.flush).raises(requests.HTTPError).when_called_with()
+        assert_that(self.order.pending).contains_key(1)
+
+    def test_backpressure(self):
+        release = threading.Event()
+        self.session.post.side_effect = lambda *args, **kwargs: release.wait() and Mock()
+        order = WriteBehindOrder(OrderRepository(), batch_size=2, max_pending=2, flush_interval=60,
+                                 session=self.session)
+        order.add_orders([OrderModel(1, 1, []), OrderModel(2, 1, [])])
+        writer = threading.Thread(target=order.add_orders,
+                                  args=([OrderModel(order_id, 1, []) for order_id in range(3, 7)],))
+        writer.start()
+        writer.join(0.2)
+        assert_that(writer.is_alive()).is_true()
+        assert_that(len(order.pending)).is_less_than_or_equal_to(2)
+        release.set()
+        writer.join(2)
+        assert_that(writer.is_alive()).is_false()
+        order.close()
+        assert_that(order.stats()['sent']).is_equal_to(6)
+
+    def test_close_flushes(self):
+        self.order.add_order(OrderModel(1, 1, []))
+        self.order.close()
+        assert_that(self.sent()).is_length(1)
+        assert_that(self.order.add_order).raises(RuntimeError).when_called_with(OrderModel(2, 1, []))
+
+    def test_context_manager_against_fake_api(self):
+        with FakeShopServer() as server:
+            with WriteBehindOrder(OrderRepository(), batch_size=10) as order:
+                order.fake_api = server.orders_url
+                for value in range(50):
+                    order.upsert_orders([OrderModel(1, 1, [{'name': 'name1', 'value': value}])])
+                order.add_order(OrderModel(2, 1, []))
+                order.add_order(OrderModel(3, 1, []))
+                order.delete_order(3)
+            assert_that(server.order_index[1]['items']).is_equal_to([{'name': 'name1', 'value': 49}])
+            assert_that(server.order_index).does_not_contain_key(3)
+            assert_that(server.requests).is_less_than_or_equal_to(3)
+
+    def tearDown(self) -> None:
+        self.session.post.side_effect = None
+        self.session.post.return_value.raise_for_status.side_effect = None
+        self.order.close()